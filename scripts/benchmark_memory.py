@@ -0,0 +1,143 @@
+"""Memory and allocation benchmark of the hot objects created during matching.
+
+Compares the slotted classes against dict-backed twins on micro-allocations,
+then the peak traced memory of a full run on a representative IMO problem
+between two revisions of the sources, by default the commit adding `__slots__`
+to statements and its parent, so that only the slots differ between the runs.
+
+Usage: python scripts/benchmark_memory.py [problem_name] [--revisions SLOTTED BASELINE]
+"""
+
+from argparse import SUPPRESS, ArgumentParser
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from newclid.agent.ddarn import DDARN
+from newclid.api import GeometricSolverBuilder
+from newclid.numerical.geometries import LineNum, PointNum
+
+N_OBJECTS = 200_000
+
+
+class DictPointNum:
+    """Dict-backed twin of PointNum running the same constructor."""
+
+    __init__ = PointNum.__init__
+
+
+class DictLineNum:
+    """Dict-backed twin of LineNum running the same constructor."""
+
+    __init__ = LineNum.__init__
+
+
+def measure(factory: Callable[[int], Any]) -> tuple[float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    objs = [factory(i) for i in range(N_OBJECTS)]
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return elapsed, peak
+
+
+def micro_benchmark():
+    cases: list[tuple[str, Callable[[int], Any], Callable[[int], Any]]] = [
+        ("PointNum", lambda i: PointNum(i, i + 1), lambda i: DictPointNum(i, i + 1)),
+        (
+            "LineNum",
+            lambda i: LineNum(coefficients=(1.0, float(i), 2.0)),
+            lambda i: DictLineNum(coefficients=(1.0, float(i), 2.0)),
+        ),
+    ]
+    for name, slotted, dict_backed in cases:
+        t_slot, m_slot = measure(slotted)
+        t_dict, m_dict = measure(dict_backed)
+        print(
+            f"{name:>10}: slots {m_slot / N_OBJECTS:6.1f} B/obj {t_slot:.3f}s"
+            f" | dict {m_dict / N_OBJECTS:6.1f} B/obj {t_dict:.3f}s"
+        )
+
+
+def problem_benchmark(problem_name: str):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    solver = (
+        GeometricSolverBuilder(seed=998244353)
+        .load_problem_from_file(Path("problems_datasets/imo_ag_30.txt"), problem_name)
+        .with_deductive_agent(DDARN())
+        .without_figure()
+        .build()
+    )
+    success = solver.run()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{problem_name}: success={success} time={elapsed:.1f}s"
+        f" peak={peak / 2**20:.1f}MiB"
+    )
+
+
+def slots_revisions(repo: Path) -> tuple[str, str]:
+    """The commit adding `__slots__` to statements and its parent."""
+    introducing = subprocess.run(
+        ["git", "log", "--reverse", "--format=%h", "-S", "__slots__", "--"]
+        + ["src/newclid/statement.py"],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    if not introducing:
+        raise ValueError("No commit adds __slots__, give the --revisions to compare")
+    return introducing[0], introducing[0] + "^"
+
+
+def revision_benchmark(problem_name: str, revision: str, repo: Path):
+    """Run the problem benchmark on the sources of the revision."""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = subprocess.run(
+            ["git", "archive", revision, "src"],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+        ).stdout
+        subprocess.run(["tar", "-x", "-C", tmp], input=archive, check=True)
+        env = dict(os.environ, PYTHONPATH=str(Path(tmp) / "src"))
+        subprocess.run(
+            [sys.executable, __file__, problem_name, "--problem-only"],
+            cwd=repo,
+            env=env,
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument("problem_name", nargs="?", default="translated_imo_2004_p5")
+    parser.add_argument(
+        "--revisions",
+        nargs=2,
+        default=None,
+        metavar=("SLOTTED", "BASELINE"),
+        help="Revisions with and without slots to compare",
+    )
+    parser.add_argument("--problem-only", action="store_true", help=SUPPRESS)
+    args = parser.parse_args()
+    if args.problem_only:
+        problem_benchmark(args.problem_name)
+        sys.exit()
+    repo = Path(__file__).resolve().parent.parent
+    micro_benchmark()
+    slotted, baseline = args.revisions or slots_revisions(repo)
+    for label, revision in (("with slots", slotted), ("without slots", baseline)):
+        print(f"{label:>13} ({revision}):", end=" ", flush=True)
+        revision_benchmark(args.problem_name, revision, repo)
@@ -1,6 +1,8 @@
 """DDAR geometric symbolic solver package"""
 
 from newclid.agent.agents_interface import DeductiveAgent
+from newclid.agent.backward_chaining import BackwardChaining
+from newclid.agent.best_first import BestFirst
 from newclid.agent.ddarn import DDARN
 from newclid.agent.human_agent import HumanAgent
 from newclid.api import GeometricSolver as GeometricSolver
@@ -8,5 +10,7 @@ from newclid.api import GeometricSolverBuilder as GeometricSolverBuilder
 
 AGENTS_REGISTRY: dict[str, type[DeductiveAgent]] = {
     "ddarn": DDARN,
+    "best_first": BestFirst,
+    "backward_chaining": BackwardChaining,
     "human_agent": HumanAgent,
 }
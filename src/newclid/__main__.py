@@ -4,7 +4,9 @@ import os
 from pathlib import Path
 
 from newclid import AGENTS_REGISTRY
-from newclid.api import GeometricSolverBuilder
+from newclid.api import GeometricSolver, GeometricSolverBuilder
+from newclid.run_loop import RunBudget
+from newclid.rule_stats import RULE_STATS_COLUMNS
 from newclid.algebraic_reasoning import algebraic_manipulator
 
 LOGGER = logging.getLogger(__name__)
@@ -51,6 +53,12 @@ def cli_arguments() -> Namespace:
         type=int,
         help="Seed for random sampling",
     )
+    parser.add_argument(
+        "--race-seeds",
+        default=None,
+        type=int,
+        help="Race this many seeds from --seed in parallel processes, keeping the run of the first to succeed",
+    )
     parser.add_argument(
         "--log-level",
         default=logging.WARNING,
@@ -62,6 +70,74 @@ def cli_arguments() -> Namespace:
         default=None,
         help="Choose one or more from {a, d, r}, to print table of equations of angles (a), distances (d), ratios (r).",
     )
+    parser.add_argument(
+        "--cache-budget",
+        default=None,
+        type=int,
+        help="Maximum number of entries of the statement and numerical-check caches",
+    )
+    parser.add_argument(
+        "--configurations",
+        default=1,
+        type=int,
+        help="Number of independent numerical configurations statements must hold in",
+    )
+    parser.add_argument(
+        "--prune-rules",
+        action="store_true",
+        help="Drop the rules that cannot help to prove the goals before running",
+    )
+    parser.add_argument(
+        "--timeout",
+        default=None,
+        type=float,
+        help="Stop the run after this many seconds",
+    )
+    parser.add_argument(
+        "--max-steps",
+        default=None,
+        type=int,
+        help="Stop the run after this many steps of the agent",
+    )
+    parser.add_argument(
+        "--max-facts",
+        default=None,
+        type=int,
+        help="Stop the run after this many facts are derived",
+    )
+    parser.add_argument(
+        "--max-rss",
+        default=None,
+        type=float,
+        help="Stop the run once the peak memory of the process reaches this many MiB",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint file the run is regularly saved to",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        default=600.0,
+        type=float,
+        help="Seconds between two checkpoints of the run",
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        help="Checkpoint file to resume the run from instead of building the problem",
+    )
+    parser.add_argument(
+        "--rule-stats",
+        default=None,
+        choices=RULE_STATS_COLUMNS,
+        help="Print the work done on each rule, sorted by the given column",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Count and time the hot paths of the build and run in the run infos",
+    )
     parser.add_argument("--quiet", action="store_true", help="Do not output any files")
     parser.add_argument(
         "--exhaust",
@@ -81,7 +157,13 @@ def main() -> None:
         args.ar_verbose if args.ar_verbose is not None else ""
     )
 
-    solver_builder = GeometricSolverBuilder(seed)
+    solver_builder = (
+        GeometricSolverBuilder(seed)
+        .with_cache_budget(args.cache_budget)
+        .with_numerical_configurations(args.configurations)
+        .with_rule_pruning(args.prune_rules)
+        .with_instrumentation(args.instrument)
+    )
 
     # problem_name = load_problem(args.problem, solver_builder)
     envpath = Path(args.env)
@@ -139,12 +221,37 @@ def main() -> None:
     if not args.quiet:
         solver_builder.with_problem_path(problem_path)
 
-    solver = solver_builder.build()
-    if not args.quiet:
-        solver.draw_figure(out_file=problem_path / "construction_figure.svg")
-    solver.run()
+    budget = RunBudget(
+        timeout=args.timeout,
+        max_steps=args.max_steps,
+        max_facts=args.max_facts,
+        max_rss_mb=args.max_rss,
+    )
+    if args.race_seeds:
+        result = solver_builder.race_seeds(
+            range(seed, seed + args.race_seeds), budget=budget
+        )
+        solver = result.solver()
+        if solver is None:
+            print(f"No seed won the race, last run infos: {result.run_infos}")
+            return
+        print(f"Seed {result.seed} won the race")
+    else:
+        if args.resume:
+            solver = GeometricSolver.from_checkpoint(Path(args.resume))
+        else:
+            solver = solver_builder.build()
+            if not args.quiet:
+                solver.draw_figure(out_file=problem_path / "construction_figure.svg")
+        solver.run(
+            budget,
+            checkpoint_path=Path(args.checkpoint) if args.checkpoint else None,
+            checkpoint_interval=args.checkpoint_interval,
+        )
 
     LOGGER.info(f"Run infos: {solver.run_infos}")
+    if args.rule_stats:
+        solver.write_rule_stats(sort_by=args.rule_stats)
     if not args.quiet:
         solver.write_all_outputs(problem_path)
 
@@ -0,0 +1,162 @@
+"""Goal-directed backward chaining agent."""
+
+from __future__ import annotations
+import logging
+from typing import TYPE_CHECKING, Generator, Iterator, Optional
+
+from newclid.agent.agents_interface import DeductiveAgent
+from newclid.agent.ddarn import DDARN
+from newclid.dependencies.symbols import Point
+from newclid.proof import ProofState
+
+if TYPE_CHECKING:
+    from newclid.formulations.rule import Rule
+    from newclid.dependencies.dependency import Dependency
+    from newclid.statement import Statement
+
+LOGGER = logging.getLogger(__name__)
+
+Search = Generator[None, None, bool]
+
+AR_FAMILIES: tuple[frozenset[str], ...] = (
+    frozenset(("para", "perp", "eqangle", "aconst")),
+    frozenset(("cong", "eqratio", "rconst", "lconst")),
+)
+"""Predicates whose statements are combined by the angle and ratio AR tables."""
+
+
+class BackwardChaining(DeductiveAgent):
+    """Apply Deductive Derivation by Backward Chaining from the goals.
+
+    A statement to prove is unified with the conclusions of the rules that
+    can conclude its predicate: their numerically valid applications are
+    the ones matched by the proof matcher, so only rules concluding a
+    predicate of a goal or a subgoal are ever matched.
+    The premises of an application are numerically true by construction,
+    they become subgoals, proven recursively up to `max_depth` rules deep
+    (iterative deepening), or by the symbolic and AR checks of `Statement.check`.
+    As AR may combine several statements into a statement of the same table,
+    applications concluding a predicate of the same AR family and sharing at
+    least two points with an unproven statement are tried next.
+    Once every premise of an application is proven its dependency is applied,
+    so proofs are written from the same dependency graph as forward agents.
+
+    If the goals are still not proven at the maximum depth,
+    the agent falls back to forward saturation with DDARN until exhaustion.
+    """
+
+    def __init__(self, max_depth: int = 5):
+        self.max_depth = max_depth
+        self.concluding: dict[Statement, list[Dependency]] = {}
+        self.by_predicate: dict[str, list[Dependency]] = {}
+        self.matched: set[Rule] = set()
+        self.failed: dict[Statement, int] = {}
+        self.fallback: Optional[DDARN] = None
+        self._search: Optional[Generator[None, None, None]] = None
+
+    def step(self, proof: ProofState, rules: list[Rule]) -> bool:
+        if proof.check_goals():
+            return False
+        if self.fallback is not None:
+            return self.fallback.step(proof, rules)
+        if self._search is None:
+            self._search = self._prove_goals(proof, rules)
+        try:
+            next(self._search)
+        except StopIteration:
+            LOGGER.debug("backward chaining : fall back to ddarn")
+            self.fallback = DDARN()
+        return True
+
+    def _prove_goals(
+        self, proof: ProofState, rules: list[Rule]
+    ) -> Generator[None, None, None]:
+        for depth in range(1, self.max_depth + 1):
+            progress = True
+            while progress:
+                progress = False
+                self.failed = {}
+                for goal in proof.goals:
+                    added = proof.dep_graph.added
+                    yield from self._prove(goal, depth, proof, rules, set())
+                    progress |= proof.dep_graph.added != added
+                if proof.check_goals():
+                    return
+
+    def _prove(
+        self,
+        statement: Statement,
+        depth: int,
+        proof: ProofState,
+        rules: list[Rule],
+        visiting: set[Statement],
+    ) -> Search:
+        """Try to prove the statement with at most `depth` nested rule applications."""
+        if statement.check():
+            return True
+        if (
+            depth == 0
+            or statement in visiting
+            or self.failed.get(statement, 0) >= depth
+        ):
+            return False
+        visiting.add(statement)
+        family = next(
+            (f for f in AR_FAMILIES if statement.predicate.NAME in f),
+            frozenset((statement.predicate.NAME,)),
+        )
+        for rule in rules:
+            if rule in self.matched or not any(
+                conclusion[0] in family for conclusion in rule.conclusions
+            ):
+                continue
+            self.matched.add(rule)
+            LOGGER.debug("backward chaining matching " + str(rule))
+            for dep in proof.rule_applications(rule):
+                self.concluding.setdefault(dep.statement, []).append(dep)
+                self.by_predicate.setdefault(dep.statement.predicate.NAME, []).append(
+                    dep
+                )
+            yield
+        proven = False
+        for dep in self._candidates(statement, family):
+            if dep.statement.check():
+                continue
+            premises_proven = True
+            for premise in dep.why:
+                if not (
+                    yield from self._prove(premise, depth - 1, proof, rules, visiting)
+                ):
+                    premises_proven = False
+                    break
+            if not premises_proven:
+                continue
+            proof.apply_dep(dep)
+            yield
+            if statement.check():
+                proven = True
+                break
+        visiting.remove(statement)
+        if not proven:
+            self.failed[statement] = depth
+        return proven
+
+    def _candidates(
+        self, statement: Statement, family: frozenset[str]
+    ) -> Iterator[Dependency]:
+        """Applications concluding the statement, then the ones AR may chain to it."""
+        yield from self.concluding.get(statement, [])
+        if len(family) == 1:
+            return
+        points = _points(statement)
+        for name in sorted(family):
+            for dep in self.by_predicate.get(name, []):
+                if (
+                    dep.statement != statement
+                    and len(points & _points(dep.statement)) >= 2
+                ):
+                    yield dep
+
+
+def _points(statement: Statement) -> set[Point]:
+    return {a for a in statement.args if isinstance(a, Point)}
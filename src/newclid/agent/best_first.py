@@ -0,0 +1,125 @@
+"""Best-first search agent, ordering the pending dependencies of all rules by heuristics."""
+
+from __future__ import annotations
+import heapq
+import logging
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from newclid.agent.agents_interface import DeductiveAgent
+from newclid.dependencies.symbols import Point
+from newclid.formulations.rule import Rule
+from newclid.proof import ProofState
+
+if TYPE_CHECKING:
+    from newclid.dependencies.dependency import Dependency
+    from newclid.statement import Statement
+
+LOGGER = logging.getLogger(__name__)
+
+Heuristic = Callable[["BestFirst", "Dependency", ProofState], float]
+"""Score of a pending dependency, the higher the sooner it is applied."""
+
+
+def goal_proximity(agent: BestFirst, dep: Dependency, proof: ProofState) -> float:
+    """Share of the points of the conclusion that appear in the goals."""
+    points = {a for a in dep.statement.args if isinstance(a, Point)}
+    if not points:
+        return 0.0
+    goal_points = {a for goal in proof.goals for a in goal.args if isinstance(a, Point)}
+    return len(points & goal_points) / len(points)
+
+
+def rule_usefulness(agent: BestFirst, dep: Dependency, proof: ProofState) -> float:
+    """Laplace-smoothed share of the applications of the rule that added a statement."""
+    return agent.usefulness(dep.reason)
+
+
+def shallow_derivation(agent: BestFirst, dep: Dependency, proof: ProofState) -> float:
+    """Minus the derivation depth of the conclusion."""
+    return -float(agent.depth_of(dep))
+
+
+DEFAULT_HEURISTICS: tuple[tuple[Heuristic, float], ...] = (
+    (goal_proximity, 1.0),
+    (rule_usefulness, 1.0),
+    (shallow_derivation, 0.1),
+)
+
+
+class BestFirst(DeductiveAgent):
+    """Apply Deductive Derivation by Best-First Search.
+
+    Matching a rule and applying a dependency are both actions of a single
+    queue, taken the best scored first. Pending dependencies are scored by the
+    weighted sum of the `heuristics`, and matching a rule by its usefulness, so
+    the most useful rules are matched first and their new dependencies compete
+    right away with the ones of the rules matched before.
+    Scores change with the applications, so they are computed again when an
+    action is popped, and it is put back if it is no longer the best.
+    Like DDARN, all rules are matched again as long as new statements are added,
+    until exhaustion.
+    """
+
+    def __init__(
+        self, heuristics: Sequence[tuple[Heuristic, float]] = DEFAULT_HEURISTICS
+    ):
+        self.heuristics = tuple(heuristics)
+        self.queue: list[tuple[float, int, Rule | Dependency]] = []
+        self.pushed = 0
+        self.any_new_statement_has_been_added = True
+        self.applications: dict[str, int] = {}
+        self.successes: dict[str, int] = {}
+        self.depth: dict[Statement, int] = {}
+
+    def usefulness(self, reason: str) -> float:
+        return (self.successes.get(reason, 0) + 1) / (
+            self.applications.get(reason, 0) + 2
+        )
+
+    def depth_of(self, dep: Dependency) -> int:
+        return 1 + max((self.depth.get(s, 0) for s in dep.why), default=0)
+
+    def score(self, action: Rule | Dependency, proof: ProofState) -> float:
+        if isinstance(action, Rule):
+            return self.usefulness(action.descrption)
+        return sum(weight * h(self, action, proof) for h, weight in self.heuristics)
+
+    def step(self, proof: ProofState, rules: list[Rule]) -> bool:
+        if proof.check_goals():
+            return False
+        if self.queue:
+            action = self._pop_best(proof)
+            if isinstance(action, Rule):
+                LOGGER.debug("best first matching" + str(action))
+                for dep in proof.match_theorem(action):
+                    self._push(-self.score(dep, proof), dep)
+            else:
+                self._apply(action, proof)
+        else:
+            if not self.any_new_statement_has_been_added:
+                return False
+            self.any_new_statement_has_been_added = False
+            for rule in rules:
+                self._push(-self.score(rule, proof), rule)
+            LOGGER.debug("best first : reload")
+        return True
+
+    def _pop_best(self, proof: ProofState) -> Rule | Dependency:
+        while True:
+            key, _, action = heapq.heappop(self.queue)
+            rescored = -self.score(action, proof)
+            if rescored > key and self.queue and rescored > self.queue[0][0]:
+                self._push(rescored, action)
+                continue
+            return action
+
+    def _apply(self, dep: Dependency, proof: ProofState) -> None:
+        self.applications[dep.reason] = self.applications.get(dep.reason, 0) + 1
+        if proof.apply_dep(dep):
+            self.successes[dep.reason] = self.successes.get(dep.reason, 0) + 1
+            self.depth[dep.statement] = self.depth_of(dep)
+            self.any_new_statement_has_been_added = True
+
+    def _push(self, key: float, action: Rule | Dependency) -> None:
+        heapq.heappush(self.queue, (key, self.pushed, action))
+        self.pushed += 1
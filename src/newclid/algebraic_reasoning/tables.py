@@ -113,6 +113,13 @@ def report(eqdict: EqDict):
     LOGGER.debug(table_str)
 
 
+def _linprog(c: np.ndarray, A_eq: np.ndarray, b_eq: np.ndarray) -> np.ndarray:
+    try:
+        return opt.linprog(c=c, A_eq=A_eq, b_eq=b_eq, method="highs")["x"]  # type: ignore
+    except ValueError:
+        return opt.linprog(c=c, A_eq=A_eq, b_eq=b_eq)["x"]  # type: ignore
+
+
 class Table:
     """The coefficient matrix."""
 
@@ -228,10 +235,7 @@ class Table:
         for v, c in vc.items():
             b_eq[self._v2i[v]] += c
 
-        try:
-            x = opt.linprog(c=self._c, A_eq=self._mA, b_eq=b_eq, method="highs")["x"]  # type: ignore
-        except ValueError:
-            x = opt.linprog(c=self._c, A_eq=self._mA, b_eq=b_eq)["x"]  # type: ignore
+        x = _linprog(self._c, self._mA, b_eq)
 
         deps: list[Dependency] = []
         for i, dep in enumerate(self.deps):
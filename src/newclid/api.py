@@ -1,7 +1,11 @@
 from __future__ import annotations
+from contextlib import nullcontext
+from functools import partial
 import logging
+import multiprocessing
+import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional, Sequence
 from typing_extensions import Self
 
 
@@ -14,10 +18,14 @@ from newclid.algebraic_reasoning.algebraic_manipulator import (
     AlgebraicManipulator,
 )
 from newclid.formulations.rule import Rule
-from newclid.proof import ProofState
+from newclid.proof import ConstructionError, ProofState
 from newclid.configs import default_defs_path, default_rules_path
 from newclid.agent.agents_interface import DeductiveAgent
-from newclid.run_loop import run_loop
+from newclid.checkpoint import Checkpoint, load_checkpoint, pickle_dumps, pickle_loads
+from newclid.instrumentation import HotPathStats, instrumented, summarize
+from newclid.run_loop import RunBudget, run_loop
+from newclid.rule_pruning import RulePruning, prune_rules_of_proof
+from newclid.rule_stats import format_rule_stats
 from newclid.formulations.problem import ProblemJGEX
 from newclid.proof_writing import write_proof_steps
 import numpy as np
@@ -31,17 +39,66 @@ LOGGER = logging.getLogger(__name__)
 
 class GeometricSolver:
     def __init__(
-        self, proof: "ProofState", rules: list[Rule], deductive_agent: DeductiveAgent
+        self,
+        proof: "ProofState",
+        rules: list[Rule],
+        deductive_agent: DeductiveAgent,
+        prune_rules: bool = False,
+        hot_paths: Optional[HotPathStats] = None,
     ) -> None:
+        """
+        With `hot_paths`, the hot paths are instrumented during runs and their stats
+        added to `hot_paths` and reported in the run infos.
+        """
         self.proof = proof
         self.rules = rules
+        self.prune_rules = prune_rules
+        self.hot_paths = hot_paths
         self.goals = proof.goals
         self.rng = proof.rng
         self.deductive_agent = deductive_agent
         self.run_infos: dict[str, Any] = {}
+        self.resumed: Optional[Checkpoint] = None
+
+    @classmethod
+    def from_checkpoint(cls, path: Path) -> "GeometricSolver":
+        """Solver continuing the run saved in the checkpoint on its next run."""
+        checkpoint = load_checkpoint(path)
+        solver = cls(checkpoint.proof, checkpoint.rules, checkpoint.deductive_agent)
+        solver.resumed = checkpoint
+        return solver
 
-    def run(self) -> bool:
-        infos = run_loop(self.deductive_agent, proof=self.proof, rules=self.rules)
+    def run(
+        self,
+        budget: Optional[RunBudget] = None,
+        checkpoint_path: Optional[Path] = None,
+        checkpoint_interval: float = 600.0,
+    ) -> bool:
+        """Run the deductive agent until it succeeds, exhausts or reaches the budget.
+
+        With a `checkpoint_path`, the run is saved every `checkpoint_interval`
+        seconds so that it can be resumed with `from_checkpoint`.
+        """
+        rules = self.rules
+        pruning: Optional[RulePruning] = None
+        if self.prune_rules:
+            pruning = prune_rules_of_proof(rules, self.proof)
+            rules = pruning.kept
+        with _instrumented_if(self.hot_paths):
+            infos = run_loop(
+                self.deductive_agent,
+                proof=self.proof,
+                rules=rules,
+                budget=budget,
+                checkpoint_path=checkpoint_path,
+                checkpoint_interval=checkpoint_interval,
+                resumed=self.resumed,
+            )
+        self.resumed = None
+        if pruning is not None:
+            infos["pruned rules"] = pruning.infos()
+        if self.hot_paths is not None:
+            infos["hot paths"] = summarize(self.hot_paths)
         self.run_infos = infos
         return infos["success"]
 
@@ -58,17 +115,85 @@ class GeometricSolver:
             with open(out_file, "w", encoding="utf-8") as f:
                 print(self.run_infos, file=f)
 
+    def write_rule_stats(
+        self, out_file: Optional[Path] = None, sort_by: str = "match_time"
+    ):
+        """Table of the work done on each rule during the run, sorted by `sort_by`."""
+        table = format_rule_stats(self.run_infos.get("rule stats", {}), sort_by)
+        if out_file is None:
+            print(table)
+        else:
+            with open(out_file, "w", encoding="utf-8") as f:
+                print(table, file=f)
+
     def write_all_outputs(self, out_folder_path: Optional[Path] = None):
         out_folder_path = out_folder_path or self.proof.problem_path
         assert out_folder_path
         out_folder_path.mkdir(exist_ok=True, parents=True)
         self.write_run_infos(out_folder_path / "run_infos.txt")
+        self.write_rule_stats(out_folder_path / "rule_stats.txt")
         self.write_proof_steps(out_folder_path / "proof_steps.txt")
         self.draw_figure(out_file=out_folder_path / "proof_figure.svg")
         pull_to_server(self.proof, server_path=out_folder_path / "html")
         LOGGER.info("Written all outputs at %s", out_folder_path)
 
 
+def _instrumented_if(hot_paths: Optional[HotPathStats]):
+    return nullcontext() if hot_paths is None else instrumented(hot_paths)
+
+
+class SeedRaceResult(NamedTuple):
+    """Outcome of building and running a problem with one seed."""
+
+    seed: int
+    success: bool
+    run_infos: dict[str, Any]
+    pickled_solver: Optional[bytes] = None
+    """Pickle of the solver after its run, only kept for a successful seed."""
+
+    def solver(self) -> Optional[GeometricSolver]:
+        """The solver after its run, to write its outputs without running it again."""
+        if self.pickled_solver is None:
+            return None
+        return pickle_loads(self.pickled_solver)
+
+
+def _run_seed(
+    seed: int,
+    *,
+    problemJGEX: ProblemJGEX,
+    defs: dict[str, DefinitionJGEX],
+    rules: list[Rule],
+    deductive_agent: Optional[DeductiveAgent],
+    max_attempts: int,
+    cache_budget: Optional[int],
+    configurations: int,
+    prune_rules: bool,
+    instrument: bool = False,
+    draw_figure: bool = False,
+    budget: Optional[RunBudget] = None,
+) -> SeedRaceResult:
+    builder = (
+        GeometricSolverBuilder(seed)
+        .load_problem(problemJGEX)
+        .with_cache_budget(cache_budget)
+        .with_numerical_configurations(configurations)
+        .with_rule_pruning(prune_rules)
+        .with_instrumentation(instrument)
+    )
+    builder._defs = defs
+    builder._rules = rules
+    builder.deductive_agent = deductive_agent
+    builder.draw_figure = draw_figure
+    try:
+        solver = builder.build(max_attempts)
+    except ConstructionError as e:
+        return SeedRaceResult(seed, False, {"error": repr(e)})
+    if not solver.run(budget):
+        return SeedRaceResult(seed, False, solver.run_infos)
+    return SeedRaceResult(seed, True, solver.run_infos, pickle_dumps(solver))
+
+
 class GeometricSolverBuilder:
     def __init__(self, seed: Optional[int] = None) -> None:
         self.problemJGEX: Optional[ProblemJGEX] = None
@@ -80,6 +205,10 @@ class GeometricSolverBuilder:
         self.seed = seed or 998244353
         self.problem_path: Optional[Path] = None
         self.draw_figure: bool = True
+        self.cache_budget: Optional[int] = None
+        self.configurations = 1
+        self.prune_rules = False
+        self.instrument = False
 
     @property
     def defs(self) -> dict[str, DefinitionJGEX]:
@@ -96,6 +225,21 @@ class GeometricSolverBuilder:
         return self._rules
 
     def build(self, max_attempts: int = 10000) -> "GeometricSolver":
+        hot_paths: Optional[HotPathStats] = {} if self.instrument else None
+        with _instrumented_if(hot_paths):
+            proof_state = self._build_proof_state(max_attempts)
+        if self.deductive_agent is None:
+            self.deductive_agent = DDARN()
+
+        return GeometricSolver(
+            proof_state,
+            self.rules,
+            self.deductive_agent,
+            self.prune_rules,
+            hot_paths=hot_paths,
+        )
+
+    def _build_proof_state(self, max_attempts: int) -> ProofState:
         if self.problemJGEX:
             LOGGER.info(f"Use problemJGEX {self.problemJGEX} to build the proof state")
             proof_state = ProofState.build_problemJGEX(
@@ -105,9 +249,13 @@ class GeometricSolverBuilder:
                 rng=np.random.default_rng(self.seed),
                 max_attempts=max_attempts,
                 draw_figure=self.draw_figure,
+                cache_budget=self.cache_budget,
+                seed=self.seed,
+                configurations=self.configurations,
             )
         else:
             LOGGER.info("Use dep_graph to build the proof state")
+            self.dep_graph.set_cache_budget(self.cache_budget)
             proof_state = ProofState(
                 rng=np.random.default_rng(self.seed),
                 dep_graph=self.dep_graph,
@@ -116,10 +264,48 @@ class GeometricSolverBuilder:
                 defs=self.defs,
                 draw_figure=self.draw_figure,
             )
-        if self.deductive_agent is None:
-            self.deductive_agent = DDARN()
+        return proof_state
 
-        return GeometricSolver(proof_state, self.rules, self.deductive_agent)
+    def race_seeds(
+        self,
+        seeds: Sequence[int],
+        max_workers: Optional[int] = None,
+        max_attempts: int = 10000,
+        budget: Optional[RunBudget] = None,
+    ) -> SeedRaceResult:
+        """Build and run the problem with each seed in a pool of processes.
+
+        Returns the result of the first seed to succeed, with its solver, and
+        terminates the other runs, or the result of the last seed to finish if none
+        succeeds. Each run stops at the `budget` if given.
+        Building with the returned seed reproduces its run serially.
+        """
+        if self.problemJGEX is None:
+            raise ValueError("Racing seeds needs a problem to build from")
+        run_seed = partial(
+            _run_seed,
+            problemJGEX=self.problemJGEX,
+            defs=self.defs,
+            rules=self.rules,
+            deductive_agent=self.deductive_agent,
+            max_attempts=max_attempts,
+            cache_budget=self.cache_budget,
+            configurations=self.configurations,
+            prune_rules=self.prune_rules,
+            instrument=self.instrument,
+            draw_figure=self.draw_figure,
+            budget=budget,
+        )
+        processes = max_workers or min(len(seeds), os.cpu_count() or 1)
+        result: Optional[SeedRaceResult] = None
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.imap_unordered(run_seed, seeds):
+                LOGGER.info(f"Seed {result.seed} finished: {result.run_infos}")
+                if result.success:
+                    break
+        if result is None:
+            raise ValueError("No seed to race")
+        return result
 
     def load_problem_from_file(
         self, problems_path: Path, problem_name: str, rename: bool = False
@@ -195,3 +381,23 @@ class GeometricSolverBuilder:
     def without_figure(self) -> Self:
         self.draw_figure = False
         return self
+
+    def with_cache_budget(self, cache_budget: Optional[int]) -> Self:
+        """Bound the number of entries of the statement and numerical-check caches."""
+        self.cache_budget = cache_budget
+        return self
+
+    def with_numerical_configurations(self, configurations: int) -> Self:
+        """Check statements numerically on several independent configurations."""
+        self.configurations = configurations
+        return self
+
+    def with_rule_pruning(self, prune_rules: bool = True) -> Self:
+        """Drop the rules that cannot help to prove the goals before running."""
+        self.prune_rules = prune_rules
+        return self
+
+    def with_instrumentation(self, instrument: bool = True) -> Self:
+        """Count and time the hot paths during the build and runs of the solver."""
+        self.instrument = instrument
+        return self
@@ -0,0 +1,111 @@
+"""Checkpoints of running proofs, to resume long runs after an interruption.
+
+A checkpoint pickles the proof state, with its dependency and symbols graphs,
+AR tables and matcher caches, together with the rules and the deductive agent
+with its buffers, so that resuming from it continues exactly as the
+interrupted run would have. The same pickling copies proof states.
+"""
+
+from __future__ import annotations
+import logging
+import os
+import pickle
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, TypeVar
+
+from newclid.formulations.rule import Rule
+
+if TYPE_CHECKING:
+    from newclid.agent.agents_interface import DeductiveAgent
+    from newclid.proof import ProofState
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statements and symbols are deeply linked objects. They are pickled in a thread
+# whose stack fits this many nested calls, so that deeper objects raise
+# RecursionError instead of overflowing the C stack.
+PICKLE_RECURSION_LIMIT = 50000
+PICKLE_STACK_SIZE = 256 * 2**20
+
+
+class Checkpoint(NamedTuple):
+    proof: ProofState
+    rules: list[Rule]
+    deductive_agent: DeductiveAgent
+    steps: int
+    """Steps of the agent done before the checkpoint."""
+    runtime: float
+    """Seconds of run before the checkpoint."""
+    added_before_run: int
+    """Number of dependencies added to the proof before the run started."""
+
+
+def _with_deep_stack(fn: Callable[[], T]) -> T:
+    """Result of `fn`, called in a thread with a stack for deep pickling."""
+    results: list[T] = []
+    errors: list[BaseException] = []
+
+    def target() -> None:
+        try:
+            results.append(fn())
+        except BaseException as e:
+            errors.append(e)
+
+    recursion_limit = sys.getrecursionlimit()
+    stack_size = threading.stack_size(PICKLE_STACK_SIZE)
+    sys.setrecursionlimit(max(recursion_limit, PICKLE_RECURSION_LIMIT))
+    try:
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(stack_size)
+        sys.setrecursionlimit(recursion_limit)
+    if errors:
+        raise errors[0]
+    return results[0]
+
+
+def pickle_copy(obj: T) -> T:
+    """Deep copy of the object through pickle, faster than `copy.deepcopy`."""
+    return _with_deep_stack(
+        lambda: pickle.loads(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    )
+
+
+def pickle_dumps(obj: object) -> bytes:
+    """Pickle of deeply linked objects, to send a proof to another process."""
+    return _with_deep_stack(lambda: pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def pickle_loads(data: bytes) -> Any:
+    return _with_deep_stack(lambda: pickle.loads(data))
+
+
+def save_checkpoint(path: Path, checkpoint: Checkpoint) -> None:
+    """Write the checkpoint, replacing the previous one only once fully written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            _with_deep_stack(
+                lambda: pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    LOGGER.info(f"Saved checkpoint at step {checkpoint.steps} to {path}")
+
+
+def load_checkpoint(path: Path) -> Checkpoint:
+    with open(path, "rb") as f:
+        checkpoint = _with_deep_stack(lambda: pickle.load(f))
+    if not isinstance(checkpoint, Checkpoint):
+        raise ValueError(f"{path} is not a checkpoint")
+    LOGGER.info(f"Loaded checkpoint at step {checkpoint.steps} from {path}")
+    return checkpoint
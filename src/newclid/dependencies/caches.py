@@ -0,0 +1,120 @@
+"""Bounded caches used by the dependency graph."""
+
+from __future__ import annotations
+from collections import OrderedDict
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    MutableMapping,
+    Optional,
+    TypeVar,
+)
+
+K = TypeVar("K")
+V = TypeVar("V")
+D = TypeVar("D")
+
+
+class BoundedCache(MutableMapping[K, V]):
+    """Mapping with an optional entry budget and least-recently-used eviction.
+
+    When over budget, the least recently used entry is evicted unless
+    `is_pinned(key, value)` is True, in which case it is moved to a pinned store
+    that is never evicted and does not count against the budget.
+    Lookups through `get` and `[]` are counted as hits or misses.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        is_pinned: Optional[Callable[[K, V], bool]] = None,
+    ) -> None:
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._pinned: dict[K, V] = {}
+        self.maxsize = maxsize
+        self.is_pinned = is_pinned
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K, default: Optional[D] = None) -> V | D | None:  # type: ignore
+        try:
+            value = self._data[key]
+        except KeyError:
+            if key in self._pinned:
+                self.hits += 1
+                return self._pinned[key]
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def __getitem__(self, key: K) -> V:
+        try:
+            value = self._data[key]
+        except KeyError:
+            if key in self._pinned:
+                self.hits += 1
+                return self._pinned[key]
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if key in self._pinned:
+            self._pinned[key] = value
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._evict()
+
+    def __delitem__(self, key: K) -> None:
+        if key in self._pinned:
+            del self._pinned[key]
+        else:
+            del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data or key in self._pinned
+
+    def __iter__(self) -> Iterator[K]:
+        return chain(self._pinned, self._data)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pinned)
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        self.maxsize = maxsize
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            self._evict()
+
+    def _evict(self) -> None:
+        assert self.maxsize is not None
+        while len(self._data) > self.maxsize:
+            key, value = self._data.popitem(last=False)
+            if self.is_pinned is not None and self.is_pinned(key, value):
+                self._pinned[key] = value
+                continue
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self),
+            "pinned": len(self._pinned),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
@@ -39,6 +39,7 @@ class Dependency(NamedTuple):
         if self.statement in dep_graph.hyper_graph:
             return
         dep_graph.hyper_graph[self.statement] = self
+        dep_graph.added += 1
         self.statement.predicate.add(self)
 
     def with_new(self, statement: Statement) -> Dependency:
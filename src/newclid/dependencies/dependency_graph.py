@@ -1,6 +1,7 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import TYPE_CHECKING, Collection, Optional
+from typing import TYPE_CHECKING, Any, Collection, Optional
+from newclid.dependencies.caches import BoundedCache
 from newclid.dependencies.dependency import IN_PREMISES
 from newclid.dependencies.symbols_graph import SymbolsGraph
 from pyvis.network import Network  # type: ignore
@@ -18,12 +19,43 @@ if TYPE_CHECKING:
 class DependencyGraph:
     """Hyper graph linking statements by dependencies as hyper-edges."""
 
-    def __init__(self, ar: "AlgebraicManipulator") -> None:
+    def __init__(
+        self, ar: "AlgebraicManipulator", cache_budget: Optional[int] = None
+    ) -> None:
+        """
+        `cache_budget` bounds the number of entries kept in each of the statement
+        and numerical-check caches, statements of the hyper graph are never evicted.
+        """
         self.symbols_graph = SymbolsGraph()
         self.hyper_graph: dict[Statement, Dependency] = {}
+        # Number of dependencies added, the symbols and tables only change with it.
+        self.added = 0
         self.ar = ar
-        self.check_numerical: dict[Statement, bool] = {}
-        self.token_statement: dict[tuple[str, ...], Optional[Statement]] = {}
+        # Bound methods rather than lambdas so that the graph can be pickled.
+        self.check_numerical: BoundedCache[Statement, bool] = BoundedCache(
+            cache_budget, is_pinned=self._checked_statement_key
+        )
+        self.token_statement: BoundedCache[tuple[str, ...], Optional[Statement]] = (
+            BoundedCache(cache_budget, is_pinned=self._checked_statement_value)
+        )
+
+    def _checked_statement_key(self, statement: Statement, _: bool) -> bool:
+        return statement in self.hyper_graph
+
+    def _checked_statement_value(
+        self, _: tuple[str, ...], statement: Optional[Statement]
+    ) -> bool:
+        return statement is not None and statement in self.hyper_graph
+
+    def set_cache_budget(self, cache_budget: Optional[int]):
+        self.check_numerical.resize(cache_budget)
+        self.token_statement.resize(cache_budget)
+
+    def cache_stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            "token_statement": self.token_statement.stats(),
+            "check_numerical": self.check_numerical.stats(),
+        }
 
     def has_edge(self, dep: Dependency):
         return (
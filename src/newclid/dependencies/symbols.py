@@ -39,6 +39,8 @@ class Symbol(ABC):
 
     """
 
+    __slots__ = ("name", "symbols_graph", "dep", "fellows", "_rep")
+
     def __init__(
         self, name: str, symbols_graph: "SymbolsGraph", dep: Optional[Dependency]
     ):
@@ -77,6 +79,8 @@ class Symbol(ABC):
 
 
 class Point(Symbol):
+    __slots__ = ("num",)
+
     num: PointNum
 
     @property
@@ -93,6 +97,8 @@ class Point(Symbol):
 class Line(Symbol):
     """Symbol of type Line."""
 
+    __slots__ = ("points", "num")
+
     points: set[Point]
     num: LineNum
 
@@ -150,6 +156,8 @@ class Line(Symbol):
 class Circle(Symbol):
     """Symbol of type Circle."""
 
+    __slots__ = ("points", "num")
+
     points: set[Point]
     num: CircleNum
 
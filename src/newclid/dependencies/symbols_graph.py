@@ -1,15 +1,29 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import TYPE_CHECKING, Collection, Optional, Type, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+)
+
+import numpy as np
 
 from newclid.algebraic_reasoning.tables import Table
 import newclid.numerical.geometries as num_geo
+from newclid.numerical.invariants import FigureInvariants
 from newclid.dependencies.symbols import Circle, Line, Point, Symbol
+from newclid.instrumentation import INSTRUMENTATION, count
 from newclid.tools import add_edge
 from pyvis.network import Network  # type: ignore
 
 if TYPE_CHECKING:
     from newclid.dependencies.dependency import Dependency
+    from newclid.predicates.predicate import Predicate
 
 S = TypeVar("S", bound="Symbol")
 CircL = TypeVar("CircL", "Circle", "Line")
@@ -23,6 +37,61 @@ class SymbolsGraph:
             Circle: list(),
         }
         self.name2node: dict[str, Symbol] = {}
+        self._figure = FigureInvariants()
+        # Coordinates of the points in every configuration, in the order of the figure.
+        self.configurations = np.zeros((1, 0, 2))
+
+    @property
+    def figure(self) -> FigureInvariants:
+        """Pairwise numerical matrices of the points, extended with points added since."""
+        points = self.nodes_of_type(Point)
+        if self._figure.n < len(points):
+            self.extend_figure(points)
+        return self._figure
+
+    def extend_figure(self, points: Collection[Point]) -> None:
+        self._figure.extend({p.name: p.num for p in points})
+
+    def figure_indices(
+        self, points: Collection[Point]
+    ) -> tuple[FigureInvariants, list[int]]:
+        figure = self.figure
+        return figure, figure.indices(p.name for p in points)
+
+    def set_configurations(
+        self, configurations: Sequence[Mapping[str, num_geo.PointNum]]
+    ) -> None:
+        """Keep other numerical configurations of the current points.
+
+        The numerical checks vectorized over configurations then only hold
+        if they hold in the current configuration and in every other one.
+        """
+        figure = self.figure
+        self.configurations = np.stack(
+            [figure.xy]
+            + [
+                np.array([(c[name].x, c[name].y) for name in figure.names])
+                for c in configurations
+            ]
+        )
+
+    def check_configurations(
+        self, predicate: type[Predicate], args: tuple[Any, ...]
+    ) -> Optional[bool]:
+        """Whether the predicate holds on the points in every configuration.
+
+        None if there is only one configuration, or the predicate or its arguments
+        cannot be checked on the coordinates of all configurations.
+        """
+        if len(self.configurations) < 2 or not all(isinstance(a, Point) for a in args):
+            return None
+        index = self._figure.index
+        width = self.configurations.shape[1]
+        indices = [index.get(a.name, width) for a in args]
+        if max(indices) >= width:
+            return None
+        holds = predicate.check_numerical_coordinates(self.configurations[:, indices])
+        return None if holds is None else bool(holds.all())
 
     def nodes_of_type(self, t: Type[S]) -> list[S]:
         return self._type2nodes[t]  # type: ignore
@@ -61,6 +130,8 @@ class SymbolsGraph:
         return node
 
     def _get_new_line_thru_pair(self, p1: Point, p2: Point) -> Line:
+        if INSTRUMENTATION.enabled:
+            count("line_thru_pair.new_line")
         name = p1.name + p2.name
         line = self.new_node(Line, name)
         line.num = num_geo.LineNum(p1.num, p2.num)
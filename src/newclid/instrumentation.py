@@ -0,0 +1,157 @@
+"""Counters and timers of the hot paths, to see where a run spends its time.
+
+Hot paths are only instrumented within `instrumented` blocks. The timed
+functions of `TIMED_PATHS` are wrapped while any block is open, and restored
+once the last one exits, while counted paths only check a flag when outside
+of these blocks. Both only record the calls made in the thread of the block,
+so solvers running concurrently in other threads are not recorded.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from functools import wraps
+import importlib
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+TIMED_PATHS: tuple[tuple[str, Optional[str], str, str], ...] = (
+    ("newclid.algebraic_reasoning.tables", "Table", "add_expr", "ar.add_expr"),
+    ("newclid.algebraic_reasoning.tables", "Table", "expr_delta", "ar.expr_delta"),
+    ("newclid.algebraic_reasoning.tables", "Table", "why", "ar.why"),
+    ("newclid.algebraic_reasoning.tables", None, "_linprog", "ar.linprog"),
+    (
+        "newclid.dependencies.symbols_graph",
+        "SymbolsGraph",
+        "line_thru_pair",
+        "line_thru_pair",
+    ),
+    (
+        "newclid.match_theorems",
+        "Matcher",
+        "check_premise_numerical",
+        "matcher.premise_check",
+    ),
+)
+"""Module, class (None for module functions), function and name of each timed path."""
+
+COUNTED_PASSES = frozenset({"matcher.premise_check"})
+"""Timed paths whose calls returning true are also counted, as `<name>.passes`."""
+
+
+class HotPathStat:
+    """Calls of an instrumented path and the seconds spent in it, if timed."""
+
+    __slots__ = ("calls", "time")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.time = 0.0
+
+
+HotPathStats = dict[str, HotPathStat]
+
+
+class _Instrumentation(threading.local):
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stats: HotPathStats = {}
+
+    def stat(self, name: str) -> HotPathStat:
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = HotPathStat()
+        return stat
+
+
+INSTRUMENTATION = _Instrumentation()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Count `n` calls of the path, callers check `INSTRUMENTATION.enabled` first."""
+    INSTRUMENTATION.stat(name).calls += n
+
+
+def _timed(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    passes = f"{name}.passes" if name in COUNTED_PASSES else None
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not INSTRUMENTATION.enabled:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+            return result
+        finally:
+            stat = INSTRUMENTATION.stat(name)
+            stat.calls += 1
+            stat.time += time.perf_counter() - start
+            if passes is not None and result:
+                INSTRUMENTATION.stat(passes).calls += 1
+
+    return wrapper
+
+
+_lock = threading.Lock()
+_open_blocks = 0
+_installed: list[tuple[Any, str, Any]] = []
+
+
+def _install() -> None:
+    """Wrap the timed paths if no block is open yet."""
+    global _open_blocks
+    with _lock:
+        if not _open_blocks:
+            try:
+                for module_name, class_name, attribute, name in TIMED_PATHS:
+                    owner: Any = importlib.import_module(module_name)
+                    if class_name is not None:
+                        owner = getattr(owner, class_name)
+                    original = owner.__dict__[attribute]
+                    setattr(owner, attribute, _timed(name, original))
+                    _installed.append((owner, attribute, original))
+            except BaseException:
+                _restore()
+                raise
+        _open_blocks += 1
+
+
+def _uninstall() -> None:
+    """Restore the timed paths once the last block exits."""
+    global _open_blocks
+    with _lock:
+        _open_blocks -= 1
+        if not _open_blocks:
+            _restore()
+
+
+def _restore() -> None:
+    while _installed:
+        owner, attribute, original = _installed.pop()
+        setattr(owner, attribute, original)
+
+
+@contextmanager
+def instrumented(stats: Optional[HotPathStats] = None) -> Iterator[HotPathStats]:
+    """Record the hot paths called by this thread within the block, into `stats` if given."""
+    stats = {} if stats is None else stats
+    previous = (INSTRUMENTATION.enabled, INSTRUMENTATION.stats)
+    installed = False
+    try:
+        _install()
+        installed = True
+        INSTRUMENTATION.enabled, INSTRUMENTATION.stats = True, stats
+        yield stats
+    finally:
+        INSTRUMENTATION.enabled, INSTRUMENTATION.stats = previous
+        if installed:
+            _uninstall()
+
+
+def summarize(stats: HotPathStats) -> dict[str, dict[str, Any]]:
+    return {
+        name: {"calls": stat.calls, "time": stat.time}
+        for name, stat in sorted(stats.items())
+    }
@@ -1,14 +1,26 @@
 """Implements theorem matching functions for the Deductive Database (DD)."""
 
+from functools import lru_cache
 import itertools
 import logging
+from operator import itemgetter
 import os
 from pathlib import Path
-from typing import TYPE_CHECKING, Generator, Optional
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Generator,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Union,
+)
 import json
 
-from newclid.formulations.clause import translate_sentence
-from newclid.dependencies.symbols import Point
+from newclid.numerical.invariants import FigureInvariants
+from newclid.predicates import NAME_TO_PREDICATE, Predicate
+from newclid.rule_stats import RuleStats
 from newclid.statement import Statement
 from newclid.dependencies.dependency import Dependency
 
@@ -19,6 +31,92 @@ if TYPE_CHECKING:
 
 LOGGER = logging.getLogger(__name__)
 
+# Predicates that can be checked numerically on points, before building the statement.
+POINTS_CHECKED_PREDICATES = {
+    name
+    for name, predicate in NAME_TO_PREDICATE.items()
+    if predicate.check_numerical_points.__func__  # type: ignore
+    is not Predicate.check_numerical_points.__func__  # type: ignore
+}
+
+
+class CompiledSentence(NamedTuple):
+    """Premise or conclusion of a rule with its predicate and argument slots resolved."""
+
+    predicate: type[Predicate]
+    points_checked: bool
+    args_of: Callable[[tuple[str, ...]], tuple[str, ...]]
+    """Arguments of the sentence given the point names assigned to the rule variables."""
+    variable_slots: Optional[tuple[int, ...]]
+    """Index of the rule variable of each argument, None if some arguments are constants."""
+
+    def tokens(self, point_names: tuple[str, ...]) -> tuple[str, ...]:
+        return (self.predicate.NAME,) + self.args_of(point_names)
+
+
+class CompiledRule(NamedTuple):
+    """Matching plan of a rule, see `compile_rule`."""
+
+    variables: tuple[str, ...]
+    premises: tuple[CompiledSentence, ...]
+    conclusions: tuple[CompiledSentence, ...]
+
+
+def _compile_sentence(
+    sentence: tuple[str, ...], variables: tuple[str, ...]
+) -> CompiledSentence:
+    slots: tuple[Union[int, str], ...] = tuple(
+        variables.index(a) if a in variables else a for a in sentence[1:]
+    )
+    args_of: Callable[[tuple[str, ...]], tuple[str, ...]]
+    if len(slots) > 1 and all(isinstance(slot, int) for slot in slots):
+        args_of = itemgetter(*slots)  # type: ignore
+    else:
+
+        def args_of(point_names: tuple[str, ...]) -> tuple[str, ...]:
+            return tuple(
+                point_names[slot] if isinstance(slot, int) else slot for slot in slots
+            )
+
+    return CompiledSentence(
+        predicate=NAME_TO_PREDICATE[sentence[0]],
+        points_checked=sentence[0] in POINTS_CHECKED_PREDICATES,
+        args_of=args_of,
+        variable_slots=tuple(slot for slot in slots if isinstance(slot, int))
+        if all(isinstance(slot, int) for slot in slots)
+        else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_rule(rule: "Rule") -> CompiledRule:
+    """Resolve once the predicates and variable slots of a rule.
+
+    Compiled rules are shared by all the matchers of the process.
+    """
+    variables = tuple(sorted(rule.variables()))
+    return CompiledRule(
+        variables=variables,
+        premises=tuple(_compile_sentence(p, variables) for p in rule.premises),
+        conclusions=tuple(_compile_sentence(c, variables) for c in rule.conclusions),
+    )
+
+
+def _product_with_new(
+    points: list[str], repeat: int, since: int
+) -> Iterator[tuple[str, ...]]:
+    """Tuples of points with at least one point after the first `since` points."""
+    if not since:
+        yield from itertools.product(points, repeat=repeat)
+        return
+    old, new = points[:since], points[since:]
+    # Partitioned by the position of the first new point.
+    for first in range(repeat):
+        for tuple_ in itertools.product(
+            *([old] * first + [new] + [points] * (repeat - first - 1))
+        ):
+            yield tuple_
+
 
 class Matcher:
     def __init__(
@@ -26,28 +124,101 @@ class Matcher:
         dep_graph: "DependencyGraph",
         runtime_cache_path: Optional[Path],
         rng: "np.random.Generator",
+        use_invariants: bool = True,
     ) -> None:
+        """
+        With `use_invariants`, mappings are generated from the bucketed numerical
+        invariants of the figure instead of every tuple of points.
+        """
         self.dep_graph = dep_graph
         self.rng = rng
+        self.use_invariants = use_invariants
         self.runtime_cache_path: Optional[Path] = None
-        self.update(runtime_cache_path)
         self.cache: dict["Rule", tuple[Dependency, ...]] = {}
+        # Number of points of the figure when each theorem was matched.
+        self.matched_points: dict["Rule", int] = {}
+        # Work done on each rule, by rule description, kept across updates.
+        self.rule_stats: dict[str, RuleStats] = {}
+        self.update(runtime_cache_path)
+
+    def update(
+        self, runtime_cache_path: Optional[Path] = None, keep_cache: bool = False
+    ):
+        """Use the runtime cache file, and reset the matches unless `keep_cache`.
 
-    def update(self, runtime_cache_path: Optional[Path] = None):
+        Kept matches only stay valid while points are added to the figure, they are
+        then extended with the mappings involving at least one new point.
+        """
         self.runtime_cache_path = runtime_cache_path
         if self.runtime_cache_path is not None and not self.runtime_cache_path.exists():
             os.makedirs(os.path.dirname(self.runtime_cache_path), exist_ok=True)
             self.runtime_cache_path.touch()
             with open(self.runtime_cache_path, "w") as f:
                 json.dump({}, f)
-        self.cache = {}
+        if not keep_cache:
+            self.cache = {}
+            self.matched_points = {}
+
+    def candidate_point_names(
+        self, compiled: CompiledRule, since: int = 0
+    ) -> Iterator[tuple[str, ...]]:
+        """Assignments of points to the rule variables that may satisfy all premises.
+
+        The premise binding the most variables among those supported by
+        `FigureInvariants` drives the enumeration, the other variables take any point.
+        Only assignments with at least one point added after the first `since`
+        points of the figure are enumerated.
+        """
+        driver: Optional[tuple[str, tuple[int, ...]]] = None
+        if self.use_invariants:
+            for premise in compiled.premises:
+                slots = premise.variable_slots
+                if slots is None or not FigureInvariants.supports(
+                    premise.predicate.NAME, len(slots)
+                ):
+                    continue
+                if driver is None or len(set(slots)) > len(set(driver[1])):
+                    driver = (premise.predicate.NAME, slots)
+        if driver is None:
+            points = self.dep_graph.symbols_graph.figure.names
+            yield from _product_with_new(points, len(compiled.variables), since)
+            return
+
+        invariants = self.dep_graph.symbols_graph.figure
+        points = invariants.names
+        name, slots = driver
+        bound = tuple(dict.fromkeys(slots))
+        free = tuple(v for v in range(len(compiled.variables)) if v not in bound)
+        assignment: list[str] = [""] * len(compiled.variables)
+        rows = invariants.bindings(name, slots)
+        has_new = (rows >= since).any(axis=1) if since else None
+        if has_new is not None and not free:
+            rows, has_new = rows[has_new], None
+        for r, row in enumerate(rows.tolist()):
+            for v, i in zip(bound, row):
+                assignment[v] = points[i]
+            rests = (
+                itertools.product(points, repeat=len(free))
+                if has_new is None or has_new[r]
+                else _product_with_new(points, len(free), since)
+            )
+            for rest in rests:
+                for v, point in zip(free, rest):
+                    assignment[v] = point
+                yield tuple(assignment)
 
     def cache_theorem(self, theorem: "Rule"):
+        """Match the theorem, only on the points added since it was last matched if any."""
+        start_time = time.perf_counter()
+        n_points = self.dep_graph.symbols_graph.figure.n
+        since = self.matched_points.get(theorem, 0) if theorem in self.cache else 0
+        if since >= n_points:
+            since = 0
         file_cache = None
         write = False
         read = False
         mappings: list[dict[str, str]] = []
-        if self.runtime_cache_path is not None:
+        if self.runtime_cache_path is not None and not since:
             with open(self.runtime_cache_path) as f:
                 file_cache = json.load(f)
             if "matcher" not in file_cache:
@@ -58,42 +229,44 @@ class Matcher:
             else:
                 file_cache["matcher"][str(theorem)] = mappings
                 write = True
-        res: set[Dependency] = set()
+        res: set[Dependency] = set(self.cache[theorem]) if since else set()
+        n_cached = len(res)
+        n_mappings = 0
+        n_numerical_passes = 0
         self.cache[theorem] = ()
-        points = [p.name for p in self.dep_graph.symbols_graph.nodes_of_type(Point)]
-        variables = theorem.variables()
+        compiled = compile_rule(theorem)
+        variables = compiled.variables
         LOGGER.debug(
             f"{theorem} matching cache : before {len(self.cache[theorem])=} {read=} {write=} {len(mappings)=}"
         )
-        for mapping in (
-            mappings
+        for point_names in (
+            (tuple(mapping[v] for v in variables) for mapping in mappings)
             if read
-            else (
-                {v: p for v, p in zip(variables, point_list)}
-                for point_list in itertools.product(points, repeat=len(variables))
-            )
+            else self.candidate_point_names(compiled, since)
         ):
+            n_mappings += 1
+            if not all(
+                self.check_premise_numerical(premise, point_names)
+                for premise in compiled.premises
+            ):
+                continue
+            n_numerical_passes += 1
             why: list[Statement] = []
             reason = theorem.descrption
             applicable = True
-            for premise in theorem.premises:
-                s = Statement.from_tokens(
-                    translate_sentence(mapping, premise), self.dep_graph
-                )
+            for premise in compiled.premises:
+                s = Statement.from_tokens(premise.tokens(point_names), self.dep_graph)
                 if s is None:
                     applicable = False
                     break
-                if not s.check_numerical():
-                    applicable = False
-                    break
                 why.append(s)
             if not applicable:
                 continue
             if write:
-                mappings.append(mapping)
-            for conclusion in theorem.conclusions:
+                mappings.append(dict(zip(variables, point_names)))
+            for conclusion in compiled.conclusions:
                 conclusion_statement = Statement.from_tokens(
-                    translate_sentence(mapping, conclusion), self.dep_graph
+                    conclusion.tokens(point_names), self.dep_graph
                 )
                 # assert conclusion_statement.check_numerical()
                 if conclusion_statement is None:
@@ -103,19 +276,66 @@ class Matcher:
         self.cache[theorem] = tuple(
             sorted(res, key=lambda x: repr(x))
         )  # to maintain determinism
+        self.matched_points[theorem] = n_points
         if self.runtime_cache_path is not None and write:
             with open(self.runtime_cache_path, "w") as f:
                 json.dump(file_cache, f)
+        stats = self.stats_of(theorem.descrption)
+        stats.mappings += n_mappings
+        stats.numerical_passes += n_numerical_passes
+        stats.cached += len(res) - n_cached
+        stats.match_time += time.perf_counter() - start_time
         LOGGER.info(
             f"{theorem} matching cache : now {len(self.cache[theorem])=} {read=} {write=} {len(mappings)=}"
         )
 
+    def check_premise_numerical(
+        self, premise: CompiledSentence, point_names: tuple[str, ...]
+    ) -> bool:
+        """Numerically check a premise with the given points assigned to the rule variables.
+
+        The statement is only built if its predicate cannot be checked on points.
+        """
+        if not premise.points_checked:
+            s = Statement.from_tokens(premise.tokens(point_names), self.dep_graph)
+            return s is not None and s.check_numerical()
+        preparsed = premise.predicate.preparse(premise.args_of(point_names))
+        if not preparsed:
+            return False
+        symbols_graph = self.dep_graph.symbols_graph
+        points = tuple(symbols_graph.name2node[n] for n in preparsed)
+        if not premise.predicate.check_numerical_points(points):  # type: ignore
+            return False
+        holds = symbols_graph.check_configurations(premise.predicate, points)  # type: ignore
+        return holds is None or holds
+
+    def stats_of(self, reason: str) -> RuleStats:
+        """Counters of the rule with the given description, created on first use."""
+        stats = self.rule_stats.get(reason)
+        if stats is None:
+            stats = self.rule_stats[reason] = RuleStats()
+        return stats
+
+    def cached_dependencies(self, theorem: "Rule") -> tuple["Dependency", ...]:
+        """Every numerically valid application of the theorem, proven or not."""
+        if self._outdated(theorem):
+            self.cache_theorem(theorem)
+        return self.cache[theorem]
+
+    def _outdated(self, theorem: "Rule") -> bool:
+        return (
+            theorem not in self.cache
+            or self.matched_points[theorem] < self.dep_graph.symbols_graph.figure.n
+        )
+
     def match_theorem(self, theorem: "Rule") -> Generator["Dependency", None, None]:
         LOGGER.debug("Start caching")
-        if theorem not in self.cache:
+        if self._outdated(theorem):
             self.cache_theorem(theorem)
         LOGGER.debug("Finish caching")
         LOGGER.debug("Start matching")
+        stats = self.stats_of(theorem.descrption)
+        start_time = time.perf_counter()
         for dep in self.cache[theorem]:
             if dep.statement in dep.statement.dep_graph.hyper_graph:
                 continue
@@ -124,5 +344,8 @@ class Matcher:
                 if not premise.check():
                     applicable = False
             if applicable:
+                stats.match_time += time.perf_counter() - start_time
                 yield dep
+                start_time = time.perf_counter()
+        stats.match_time += time.perf_counter() - start_time
         LOGGER.debug("Finish matching")
@@ -1,3 +1,5 @@
+import numpy as np
+
 ATOM = 1e-9
 REL_TOL = 0.001
 
@@ -12,3 +14,14 @@ def nearly_zero(a: float) -> bool:
 
 def sign(a: float) -> int:
     return 0 if nearly_zero(a) else (1 if a > 0 else -1)
+
+
+def close_enough_array(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Elementwise `close_enough`."""
+    diff = np.abs(a - b)
+    return (diff < 4 * ATOM) | (diff < REL_TOL * np.maximum(np.abs(a), np.abs(b)))
+
+
+def consecutive_close_enough(values: np.ndarray) -> np.ndarray:
+    """Whether consecutive values along the last axis are all `close_enough`."""
+    return close_enough_array(values[..., 1:], values[..., :-1]).all(-1)
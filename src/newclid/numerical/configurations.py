@@ -0,0 +1,82 @@
+"""Persisted numerical configurations of built problems.
+
+The positions of the points accepted while building a problem are saved with the
+state of the random generator after the build, keyed by the problem text, a hash of
+the construction definitions and the seed, so that a later build of the same problem
+reloads them instead of sampling again.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Sequence
+
+from newclid.formulations.clause import Clause
+from newclid.formulations.definition import DefinitionJGEX
+from newclid.formulations.problem import ProblemJGEX
+from newclid.numerical.geometries import PointNum
+
+LOGGER = logging.getLogger(__name__)
+
+
+class NumericalConfiguration(NamedTuple):
+    """Positions of the points of each construction and generator state after build."""
+
+    positions: list[tuple[PointNum, ...]]
+    rng_state: dict[str, Any]
+
+
+def configuration_key(
+    problem: ProblemJGEX, defs: dict[str, DefinitionJGEX], seed: int
+) -> str:
+    defs_hash = hashlib.sha256(
+        "\n".join(repr(defs[name]) for name in sorted(defs)).encode()
+    ).hexdigest()
+    return f"{seed} {defs_hash} {problem}"
+
+
+def load_configuration(
+    path: Path, key: str, constructions: Sequence[Clause]
+) -> Optional[NumericalConfiguration]:
+    """Saved configuration of the key, if it has positions for every construction."""
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            saved = json.load(f)[key]
+        positions = [
+            tuple(PointNum(x, y) for x, y in points) for points in saved["positions"]
+        ]
+        rng_state = saved["rng_state"]
+    except (KeyError, TypeError, ValueError):
+        return None
+    if len(positions) != len(constructions) or any(
+        len(points) != len(construction.points)
+        for points, construction in zip(positions, constructions)
+    ):
+        LOGGER.info(f"Ignore stale numerical configuration in {path}")
+        return None
+    return NumericalConfiguration(positions, rng_state)
+
+
+def save_configuration(
+    path: Path, key: str, configuration: NumericalConfiguration
+) -> None:
+    saved: dict[str, Any] = {}
+    if path.exists():
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+        except ValueError:
+            saved = {}
+    saved[key] = {
+        "positions": [
+            [(p.x, p.y) for p in points] for points in configuration.positions
+        ],
+        "rng_state": configuration.rng_state,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(saved, f)
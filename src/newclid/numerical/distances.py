@@ -1,4 +1,7 @@
-from typing import Sequence
+from typing import Iterable, Sequence
+
+import numpy as np
+
 from newclid.numerical.geometries import PointNum
 
 
@@ -10,35 +13,98 @@ class PointTooFarError(Exception):
     pass
 
 
+class PointSetStatistics:
+    """Coordinates of a set of points and the sum of their pairwise distances.
+
+    The sum is updated with the distances of the new points only as points are
+    added, so that the too close and too far checks stay linear in the number of
+    points.
+    """
+
+    def __init__(self, points: Iterable[PointNum] = ()) -> None:
+        self.xy = np.zeros((0, 2))
+        self.distance_sum = 0.0
+        self.add(points)
+
+    def __len__(self) -> int:
+        return len(self.xy)
+
+    def add(self, points: Iterable[PointNum]) -> None:
+        new = np.array([(p.x, p.y) for p in points], dtype=float).reshape(-1, 2)
+        if not len(new):
+            return
+        to_old = _distances(new, self.xy)
+        between_new = _distances(new, new)
+        self.distance_sum += 2 * float(to_old.sum()) + float(between_new.sum())
+        self.xy = np.concatenate((self.xy, new))
+
+    @property
+    def mean_distance(self) -> float:
+        n = len(self)
+        return self.distance_sum / n / (n - 1) if n >= 2 else 0.0
+
+    def within_bounds(
+        self, candidates: np.ndarray, too_close: float = 0.1, too_far: float = 10.0
+    ) -> np.ndarray:
+        """Mask of the candidate coordinates neither too close nor too far from the points.
+
+        Each candidate must be at a distance of every point between `too_close` and
+        `too_far` times the mean distance between points.
+        """
+        if len(self) < 2:
+            return np.ones(len(candidates), dtype=bool)
+        mean = self.mean_distance
+        distances = _distances(candidates, self.xy)
+        return ((distances >= too_close * mean) & (distances <= too_far * mean)).all(
+            axis=1
+        )
+
+    def check(
+        self,
+        newpoints: Sequence[PointNum],
+        too_close: float = 0.1,
+        too_far: float = 10.0,
+    ) -> None:
+        """Raise if a new point is too close, or else too far, from the points."""
+        if len(self) < 2 or not newpoints:
+            return
+        mean = self.mean_distance
+        distances = _distances(np.array([(p.x, p.y) for p in newpoints]), self.xy)
+        if (distances < too_close * mean).any():
+            raise PointTooCloseError()
+        if (distances > too_far * mean).any():
+            raise PointTooFarError()
+
+
+def _distances(xy: np.ndarray, other: np.ndarray) -> np.ndarray:
+    return np.sqrt(((xy[:, None, :] - other[None, :, :]) ** 2).sum(-1))
+
+
 def check_too_close_numerical(
     newpoints: Sequence[PointNum], points: Sequence[PointNum], tol: float = 0.1
 ) -> bool:
-    if len(points) < 2:
-        return False
-    mindist = (
-        sum([sum([p.distance(p1) for p1 in points if p1 != p]) for p in points])
-        / len(points)
-        / (len(points) - 1)
-    )
-    for p0 in newpoints:
-        for p1 in points:
-            if p0.distance(p1) < tol * mindist:
-                return True
+    try:
+        PointSetStatistics(points).check(newpoints, too_close=tol, too_far=np.inf)
+    except PointTooCloseError:
+        return True
     return False
 
 
 def check_too_far_numerical(
     newpoints: Sequence[PointNum], points: Sequence[PointNum], tol: float = 10.0
 ) -> bool:
-    if len(points) < 2:
-        return False
-    maxdist = (
-        sum([sum([p.distance(p1) for p1 in points if p1 != p]) for p in points])
-        / len(points)
-        / (len(points) - 1)
-    )
-    for p0 in newpoints:
-        for p1 in points:
-            if p0.distance(p1) > tol * maxdist:
-                return True
+    try:
+        PointSetStatistics(points).check(newpoints, too_close=0.0, too_far=tol)
+    except PointTooFarError:
+        return True
     return False
+
+
+def within_distance_bounds(
+    candidates: np.ndarray,
+    points: Sequence[PointNum],
+    too_close: float = 0.1,
+    too_far: float = 10.0,
+) -> np.ndarray:
+    """Mask of the candidate coordinates passing both checks above against points."""
+    return PointSetStatistics(points).within_bounds(candidates, too_close, too_far)
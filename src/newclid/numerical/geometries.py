@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, Optional, Sequence, Union
+import math
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
 
 from numpy.random import Generator
 from newclid.numerical import close_enough, nearly_zero, sign
@@ -7,50 +8,57 @@ import numpy as np
 
 
 ObjNum = Union["PointNum", "LineNum", "CircleNum"]
+# Mask of the valid positions among an array of candidate coordinates.
+CandidatesFilter = Callable[[np.ndarray], np.ndarray]
+
+# number of candidates drawn at once when sampling with a filter.
+SAMPLING_BATCH = 16
 
 
 class PointNum:
-    """Numerical point."""
+    """Numerical point, never modified once created.
+
+    Coordinates are kept as computed, values close to zero are only
+    treated as zero by the comparisons.
+    """
+
+    __slots__ = ("x", "y")
 
     def __init__(self, x: Any, y: Any):
         self.x: float = float(x)
         self.y: float = float(y)
-        if nearly_zero(self.x):
-            self.x = 0.0
-        if nearly_zero(self.y):
-            self.y = 0.0
 
     def __add__(self, p: "PointNum") -> "PointNum":
-        return PointNum(self.x + p.x, self.y + p.y)
+        return _point(self.x + p.x, self.y + p.y)
 
     def __sub__(self, p: "PointNum") -> "PointNum":
-        return PointNum(self.x - p.x, self.y - p.y)
+        return _point(self.x - p.x, self.y - p.y)
 
     def __mul__(self, f: Any) -> "PointNum":
         f = float(f)
-        return PointNum(self.x * f, self.y * f)
+        return _point(self.x * f, self.y * f)
 
     def __rmul__(self, f: Any) -> "PointNum":
-        return self * float(f)
+        return self * f
 
     def __truediv__(self, f: Any) -> "PointNum":
         f = float(f)
-        return PointNum(self.x / f, self.y / f)
+        return _point(self.x / f, self.y / f)
 
     def __str__(self) -> str:
         return "PointNum({},{})".format(self.x, self.y)
 
-    def __abs__(self) -> str:
-        return np.sqrt(self.dot(self))
+    def __abs__(self) -> float:
+        return math.sqrt(self.dot(self))
 
     def angle(self) -> float:
-        return np.arctan2(self.y, self.x)
+        return math.atan2(self.y, self.x)
 
     def close_enough(self, point: "PointNum") -> bool:
         return close_enough(self.x, point.x) and close_enough(self.y, point.y)
 
     def distance(self, p: Union["PointNum", "LineNum", "CircleNum"]) -> float:
-        return np.sqrt(self.distance2(p))
+        return math.sqrt(self.distance2(p))
 
     def distance2(self, p: Union["PointNum", "LineNum", "CircleNum"]) -> float:
         if isinstance(p, LineNum):
@@ -66,10 +74,10 @@ class PointNum:
         return dx2 + dy2
 
     def rot90(self) -> "PointNum":
-        return PointNum(-self.y, self.x)
+        return _point(-self.y, self.x)
 
     def rotatea(self, ang: Any) -> "PointNum":
-        sinb, cosb = np.sin(ang), np.cos(ang)
+        sinb, cosb = math.sin(ang), math.cos(ang)
         return self.rotate(sinb, cosb)
 
     def rotate(self, sinb: Any, cosb: Any) -> "PointNum":
@@ -77,7 +85,7 @@ class PointNum:
         return PointNum(x * cosb - y * sinb, x * sinb + y * cosb)
 
     def flip(self) -> "PointNum":
-        return PointNum(-self.x, self.y)
+        return _point(-self.x, self.y)
 
     def perpendicular_line(self, line: "LineNum") -> "LineNum":
         return line.perpendicular_line(self)
@@ -109,17 +117,57 @@ class PointNum:
         raise NotImplementedError()
 
 
+_new_point = object.__new__
+
+
+def _point(x: float, y: float) -> PointNum:
+    """PointNum from float coordinates, skipping the conversions of the constructor."""
+    p = _new_point(PointNum)
+    p.x = x
+    p.y = y
+    return p
+
+
 class FormNum(ABC):
+    __slots__ = ()
+
     @abstractmethod
+    def sample_candidates(
+        self, points: Sequence[PointNum], n: int, *, rng: Generator
+    ) -> np.ndarray:
+        """Coordinates of n random points of the form, within the boundary of points."""
+
     def sample_within(
-        self, points: Sequence[PointNum], *, trials: int = 5, rng: Generator
+        self,
+        points: Sequence[PointNum],
+        *,
+        trials: int = 5,
+        rng: Generator,
+        valid: Optional[CandidatesFilter] = None,
     ) -> PointNum:
-        ...
+        """Sample a point within the boundary of points.
+
+        Of `trials` candidates drawn at once, keeps the furthest from the points.
+        With a `valid` filter, `SAMPLING_BATCH` candidates are drawn at once
+        and the trials are the first valid ones.
+        """
+        n = trials if valid is None else max(trials, SAMPLING_BATCH)
+        candidates = self.sample_candidates(points, n, rng=rng)
+        if valid is not None:
+            candidates = candidates[valid(candidates)][:trials]
+            if not len(candidates):
+                raise InvalidSampleError
+        xy = np.array([(p.x, p.y) for p in points])
+        mind = np.sqrt(((candidates[:, None, :] - xy[None, :, :]) ** 2).sum(-1))
+        x, y = candidates[int(np.argmax(mind.min(axis=1)))]
+        return PointNum(float(x), float(y))
 
 
 class LineNum(FormNum):
     """Numerical line."""
 
+    __slots__ = ("coefficients",)
+
     def __init__(
         self,
         p1: Optional["PointNum"] = None,
@@ -155,7 +203,7 @@ class LineNum(FormNum):
         if nearly_zero(c):
             c = 0.0
 
-        d = np.sqrt(a**2 + b**2)
+        d = math.sqrt(a**2 + b**2)
         self.coefficients = a / d, b / d, c / d
 
     def parallel_line(self, p: "PointNum") -> "LineNum":
@@ -224,10 +272,9 @@ class LineNum(FormNum):
             return False
         return d1 * d2 > 0
 
-    def sample_within(
-        self, points: Sequence[PointNum], *, trials: int = 5, rng: Generator
-    ) -> PointNum:
-        """Sample a point within the boundary of points."""
+    def sample_candidates(
+        self, points: Sequence[PointNum], n: int, *, rng: Generator
+    ) -> np.ndarray:
         center = sum(points, PointNum(0.0, 0.0)) / len(points)
         radius = max([p.distance(center) for p in points])
 
@@ -235,17 +282,8 @@ class LineNum(FormNum):
             center = center.foot(self)
         a, b = line_circle_intersection(self, CircleNum(center.foot(self), radius))
 
-        result = None
-        best = -1.0
-        for _ in range(trials):
-            rand = rng.uniform(0.0, 1.0)
-            x = a + (b - a) * rand
-            mind = min([x.distance(p) for p in points])
-            if mind > best:
-                best = mind
-                result = x
-        assert result
-        return result
+        rand = rng.uniform(0.0, 1.0, size=n)
+        return np.stack((a.x + (b.x - a.x) * rand, a.y + (b.y - a.y) * rand), axis=1)
 
     def angle(self) -> float:
         if nearly_zero(self.coefficients[1]):
@@ -259,6 +297,8 @@ class LineNum(FormNum):
 class CircleNum(FormNum):
     """Numerical circle."""
 
+    __slots__ = ("center", "a", "b", "r2", "radius")
+
     def __init__(
         self,
         center: Optional[PointNum] = None,
@@ -289,23 +329,17 @@ class CircleNum(FormNum):
             self.radius = radius
             self.r2 = radius * radius
 
-    def sample_within(
-        self, points: Sequence[PointNum], *, trials: int = 5, rng: Generator
-    ) -> PointNum:
-        """Sample a point within the boundary of points."""
-        result = None
-        best = -1.0
-
-        for _ in range(trials):
-            ang = rng.uniform(0.0, 2.0) * np.pi
-            x = self.center + PointNum(np.cos(ang), np.sin(ang)) * self.radius
-            mind = min([x.distance(p) for p in points])
-            if mind > best:
-                best = mind
-                result = x
-
-        assert result
-        return result
+    def sample_candidates(
+        self, points: Sequence[PointNum], n: int, *, rng: Generator
+    ) -> np.ndarray:
+        ang = rng.uniform(0.0, 2.0, size=n) * np.pi
+        return np.stack(
+            (
+                self.center.x + np.cos(ang) * self.radius,
+                self.center.y + np.sin(ang) * self.radius,
+            ),
+            axis=1,
+        )
 
 
 def perpendicular_bisector(p1: "PointNum", p2: "PointNum") -> "LineNum":
@@ -321,6 +355,10 @@ class InvalidReduceError(Exception):
     pass
 
 
+class InvalidSampleError(Exception):
+    """None of the sampled candidates is valid, another draw may find one."""
+
+
 def solve_quad(a: float, b: float, c: float) -> tuple[float, ...]:
     """Solve a x^2 + bx + c = 0."""
     if nearly_zero(a):
@@ -332,7 +370,7 @@ def solve_quad(a: float, b: float, c: float) -> tuple[float, ...]:
         return ()
     if sd == 0:
         d = 0.0
-    y = np.sqrt(d)
+    y = math.sqrt(d)
     if nearly_zero(y):
         return (-b / a,)
     return (-b - y) / a, (-b + y) / a
@@ -362,7 +400,7 @@ def circle_circle_intersection(c1: CircleNum, c2: CircleNum) -> tuple[PointNum,
     d = (x1 - x0) ** 2 + (y1 - y0) ** 2
     if nearly_zero(d):
         raise InvalidIntersectError
-    d: float = np.sqrt(d)
+    d = math.sqrt(d)
 
     if not (r0 + r1 >= d and abs(r0 - r1) <= d):
         return ()
@@ -437,27 +475,33 @@ def reduce(
     objs: Sequence[ObjNum],
     existing_points: Sequence[PointNum],
     rng: Generator,
+    valid: Optional[CandidatesFilter] = None,
 ) -> tuple[PointNum, ...]:
     """
     If all PointNum, then no touch.
     Else reduce intersecting objects into one point of intersections other than the existing points.
+    A single form is sampled, among the positions accepted by `valid` if given.
     """
     if all(isinstance(o, PointNum) for o in objs):
         return tuple(objs)  # type: ignore
     elif len(objs) == 1:
         obj = objs[0]
         assert isinstance(obj, FormNum)
-        return (obj.sample_within(existing_points, rng=rng),)
+        return (obj.sample_within(existing_points, rng=rng, valid=valid),)
 
     elif len(objs) == 2:
         u, v = objs
         assert isinstance(u, FormNum)
         assert isinstance(v, FormNum)
-        result = np.array(intersect(u, v))
-        rng.shuffle(result)
-        for p in result:
-            if all(not p.close_enough(x) for x in existing_points):
-                return (p,)
-        raise InvalidReduceError
+        result = [
+            p
+            for p in intersect(u, v)
+            if all(not p.close_enough(x) for x in existing_points)
+        ]
+        if not result:
+            raise InvalidReduceError
+        if len(result) == 1:
+            return (result[0],)
+        return (result[rng.integers(len(result))],)
     else:
         raise NotImplementedError
@@ -0,0 +1,315 @@
+"""Bucketed numerical invariants of a figure, used to generate matching candidates.
+
+Segment lengths, line directions modulo pi, oriented angles between lines and
+ratios of lengths are hashed into buckets at least as wide as the tolerance of
+`close_enough`, so every numerically true `cong`, `para`, `perp`, `eqangle` and
+`eqratio` lies in the same or a neighbouring bucket. Circles are fitted through
+point triples to find `cyclic` candidates.
+
+Candidates are a superset of the numerically true statements,
+they must still go through the predicates numerical checks.
+The same pairwise matrices serve those checks for the predicates reading
+distances and directions of segments, and numerical lines and circles through
+pairs and triples of points are memoized for the predicates reading those.
+"""
+
+from __future__ import annotations
+import itertools
+from typing import Callable, Iterable, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+from newclid.numerical import ATOM, REL_TOL
+from newclid.numerical.geometries import CircleNum, LineNum, PointNum
+
+# Even number of buckets over [0, pi) so that a right angle is a whole number of buckets.
+ANGLE_BUCKETS = 2 * int(1 / (4 * REL_TOL))
+# Width of the buckets of logarithms of lengths and ratios.
+LOG_WIDTH = 2 * REL_TOL
+
+
+class _GroupKind(NamedTuple):
+    size: int
+    circular: bool
+    value: Callable[["FigureInvariants", np.ndarray], np.ndarray]
+    shift: int = 0
+
+
+def _length(inv: "FigureInvariants", cols: np.ndarray) -> np.ndarray:
+    return inv.log_distance2[cols[:, 0], cols[:, 1]]
+
+
+def _direction(inv: "FigureInvariants", cols: np.ndarray) -> np.ndarray:
+    return inv.direction[cols[:, 0], cols[:, 1]]
+
+
+def _angle(inv: "FigureInvariants", cols: np.ndarray) -> np.ndarray:
+    return (
+        inv.direction[cols[:, 2], cols[:, 3]] - inv.direction[cols[:, 0], cols[:, 1]]
+    ) % np.pi
+
+
+def _ratio(inv: "FigureInvariants", cols: np.ndarray) -> np.ndarray:
+    return 0.5 * (
+        inv.log_distance2[cols[:, 0], cols[:, 1]]
+        - inv.log_distance2[cols[:, 2], cols[:, 3]]
+    )
+
+
+class _GroupTable(NamedTuple):
+    n: int
+    """Number of points of the figure the table was built for."""
+    combos: np.ndarray
+    """Assignments of the variables of the group, one row each."""
+    buckets: np.ndarray
+
+
+def _new_combos(old: int, n: int, size: int) -> np.ndarray:
+    """Tuples of `size` indices below n with at least one from `old` on."""
+    parts = []
+    for first_new in range(size):
+        shape = (old,) * first_new + (n - old,) + (n,) * (size - first_new - 1)
+        combos = np.indices(shape, dtype=np.int32).reshape(size, -1)
+        combos[first_new] += old
+        parts.append(combos.T)
+    return np.concatenate(parts)
+
+
+GROUP_KINDS: dict[str, _GroupKind] = {
+    "cong": _GroupKind(2, False, _length),
+    "para": _GroupKind(2, True, _direction),
+    "perp": _GroupKind(2, True, _direction, shift=ANGLE_BUCKETS // 2),
+    "eqangle": _GroupKind(4, True, _angle),
+    "eqratio": _GroupKind(4, False, _ratio),
+}
+
+
+class FigureInvariants:
+    """Pairwise numerical invariants of the points of a figure.
+
+    Points are indexed by their order of insertion, `index` maps their names to it.
+    `distance`, `distance2`, `log_distance2` and `direction` (angle modulo pi of the
+    vector from the row point to the column point) are n x n matrices extended
+    with new rows and columns as points are added.
+    Lines and circles through points are built once per unordered pair and triple,
+    and the bucketed tables of the groups of a predicate once per pattern of
+    variables, only extended with the assignments of points added since.
+    """
+
+    def __init__(self, points: Optional[Mapping[str, PointNum]] = None) -> None:
+        self.names: list[str] = []
+        self.index: dict[str, int] = {}
+        self.points: list[PointNum] = []
+        self.xy = np.zeros((0, 2))
+        self.distance2 = np.zeros((0, 0))
+        self.distance = np.zeros((0, 0))
+        self.log_distance2 = np.zeros((0, 0))
+        self.direction = np.zeros((0, 0))
+        self._lines: dict[tuple[int, int], LineNum] = {}
+        self._circles: dict[tuple[int, ...], Optional[CircleNum]] = {}
+        self._group_tables: dict[tuple[str, tuple[int, ...]], _GroupTable] = {}
+        if points:
+            self.extend(points)
+
+    @property
+    def n(self) -> int:
+        return len(self.points)
+
+    def extend(self, points: Mapping[str, PointNum]) -> None:
+        """Add the points not yet in the figure, only computing their rows and columns."""
+        new = [(name, num) for name, num in points.items() if name not in self.index]
+        if not new:
+            return
+        old = self.n
+        for name, num in new:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.points.append(num)
+        new_xy = np.array([(num.x, num.y) for _, num in new], dtype=float)
+        self.xy = np.concatenate((self.xy, new_xy))
+        # From each new point to every point, and the reverse for the new columns.
+        delta = self.xy[None, :, :] - new_xy[:, None, :]
+        distance2 = (delta**2).sum(-1)
+        self.distance2 = self._grown(self.distance2, distance2, distance2[:, :old].T)
+        self.distance = self._grown(
+            self.distance, np.sqrt(distance2), np.sqrt(distance2[:, :old].T)
+        )
+        with np.errstate(divide="ignore"):
+            log_distance2 = np.log(distance2)
+        self.log_distance2 = self._grown(
+            self.log_distance2, log_distance2, log_distance2[:, :old].T
+        )
+        reverse = -delta[:, :old].transpose(1, 0, 2)
+        self.direction = self._grown(
+            self.direction,
+            np.arctan2(delta[..., 1], delta[..., 0]) % np.pi,
+            np.arctan2(reverse[..., 1], reverse[..., 0]) % np.pi,
+        )
+
+    @staticmethod
+    def _grown(matrix: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        old = len(matrix)
+        grown = np.empty((rows.shape[1], rows.shape[1]))
+        grown[:old, :old] = matrix
+        grown[:old, old:] = columns
+        grown[old:, :] = rows
+        return grown
+
+    def indices(self, names: Iterable[str]) -> list[int]:
+        return [self.index[name] for name in names]
+
+    def line(self, i: int, j: int) -> LineNum:
+        """Numerical line through points i and j."""
+        key = (i, j) if i < j else (j, i)
+        line = self._lines.get(key)
+        if line is None:
+            line = LineNum(self.points[key[0]], self.points[key[1]])
+            self._lines[key] = line
+        return line
+
+    def circle(self, i: int, j: int, k: int) -> Optional[CircleNum]:
+        """Numerical circle through points i, j and k, None if they are collinear."""
+        key = tuple(sorted((i, j, k)))
+        if key in self._circles:
+            return self._circles[key]
+        a, b, c = (self.points[x] for x in key)
+        try:
+            circle: Optional[CircleNum] = CircleNum(p1=a, p2=b, p3=c)
+        except ValueError:
+            circle = None
+        self._circles[key] = circle
+        return circle
+
+    @classmethod
+    def supports(cls, predicate_name: str, arity: int) -> bool:
+        if predicate_name == "cyclic":
+            return arity >= 4
+        kind = GROUP_KINDS.get(predicate_name)
+        if kind is None or arity % kind.size or arity < 2 * kind.size:
+            return False
+        return not kind.shift or arity == 2 * kind.size
+
+    def bindings(self, predicate_name: str, slots: tuple[int, ...]) -> np.ndarray:
+        """Candidate assignments of the distinct slots, in order of first appearance.
+
+        Every assignment of points for which the predicate holds numerically is a row.
+        """
+        variables = tuple(dict.fromkeys(slots))
+        if predicate_name == "cyclic":
+            return self._cyclic_bindings(slots, variables)
+        kind = GROUP_KINDS[predicate_name]
+        groups = [slots[i : i + kind.size] for i in range(0, len(slots), kind.size)]
+        assigned, buckets = self._group_table(predicate_name, groups[0])
+        for group in groups[1:]:
+            assigned, buckets = self._join(predicate_name, assigned, buckets, group)
+        return np.stack([assigned[v] for v in variables], axis=1).reshape(
+            -1, len(variables)
+        )
+
+    def _group_table(
+        self, predicate_name: str, group: tuple[int, ...]
+    ) -> tuple[dict[int, np.ndarray], np.ndarray]:
+        variables = tuple(dict.fromkeys(group))
+        pattern = tuple(variables.index(v) for v in group)
+        key = (predicate_name, pattern)
+        table = self._group_tables.get(key)
+        if table is None or table.n < self.n:
+            table = self._extended_table(GROUP_KINDS[predicate_name], pattern, table)
+            self._group_tables[key] = table
+        return {v: table.combos[:, i] for i, v in enumerate(variables)}, table.buckets
+
+    def _extended_table(
+        self, kind: _GroupKind, pattern: tuple[int, ...], table: Optional[_GroupTable]
+    ) -> _GroupTable:
+        """The table of the pattern with the assignments of the points added since."""
+        old = 0 if table is None else table.n
+        combos = _new_combos(old, self.n, max(pattern) + 1)
+        cols = combos[:, list(pattern)]
+        valid = np.ones(len(cols), dtype=bool)
+        for i in range(0, kind.size, 2):
+            valid &= cols[:, i] != cols[:, i + 1]
+        combos, cols = combos[valid], cols[valid]
+        values = kind.value(self, cols)
+        if kind.circular:
+            buckets = np.floor(values / (np.pi / ANGLE_BUCKETS)).astype(np.int64)
+            buckets %= ANGLE_BUCKETS
+        else:
+            buckets = np.floor(values / LOG_WIDTH).astype(np.int64)
+        if table is not None:
+            combos = np.concatenate((table.combos, combos))
+            buckets = np.concatenate((table.buckets, buckets))
+        return _GroupTable(self.n, combos, buckets)
+
+    def _join(
+        self,
+        predicate_name: str,
+        assigned: dict[int, np.ndarray],
+        buckets: np.ndarray,
+        group: tuple[int, ...],
+    ) -> tuple[dict[int, np.ndarray], np.ndarray]:
+        kind = GROUP_KINDS[predicate_name]
+        right, right_buckets = self._group_table(predicate_name, group)
+        shared = [v for v in right if v in assigned]
+        if kind.circular:
+            offset, modulo = 0, ANGLE_BUCKETS
+        else:
+            all_buckets = np.concatenate((buckets, right_buckets))
+            low = int(all_buckets.min()) if len(all_buckets) else 0
+            high = int(all_buckets.max()) if len(all_buckets) else 0
+            offset, modulo = 1 - low, high - low + 3
+
+        def keys(columns: dict[int, np.ndarray], bucket: np.ndarray) -> np.ndarray:
+            key = np.zeros(len(bucket), dtype=np.int64)
+            for v in shared:
+                key = key * self.n + columns[v]
+            return key * modulo + bucket
+
+        right_keys = keys(right, right_buckets + offset)
+        order = np.argsort(right_keys, kind="stable")
+        sorted_keys = right_keys[order]
+        left_parts: list[np.ndarray] = []
+        right_parts: list[np.ndarray] = []
+        for delta in (-1, 0, 1):
+            shifted = buckets + kind.shift + delta + offset
+            if kind.circular:
+                shifted %= ANGLE_BUCKETS
+            left_keys = keys(assigned, shifted)
+            low = np.searchsorted(sorted_keys, left_keys, "left")
+            counts = np.searchsorted(sorted_keys, left_keys, "right") - low
+            starts = np.repeat(low - np.cumsum(counts) + counts, counts)
+            left_parts.append(np.repeat(np.arange(len(left_keys)), counts))
+            right_parts.append(order[np.arange(int(counts.sum())) + starts])
+        left_idx = np.concatenate(left_parts)
+        right_idx = np.concatenate(right_parts)
+        joined = {v: column[left_idx] for v, column in assigned.items()}
+        for v, column in right.items():
+            if v not in joined:
+                joined[v] = column[right_idx]
+        return joined, right_buckets[right_idx]
+
+    def _cyclic_bindings(
+        self, slots: tuple[int, ...], variables: tuple[int, ...]
+    ) -> np.ndarray:
+        arity = len(slots)
+        rows: list[tuple[int, ...]] = []
+        if len(variables) == arity:
+            for i, j, k in itertools.combinations(range(self.n), 3):
+                concyclic = self._on_circle_through(i, j, k)
+                if concyclic is None:
+                    continue
+                for others in itertools.combinations(concyclic, arity - 3):
+                    rows.extend(itertools.permutations((i, j, k) + others))
+        return np.array(rows, dtype=np.int32).reshape(-1, len(variables))
+
+    def _on_circle_through(self, i: int, j: int, k: int) -> Optional[list[int]]:
+        """Points after k that may lie on the circle through points i, j and k."""
+        circle = self.circle(i, j, k)
+        if circle is None:
+            return None
+        others = self.xy[k + 1 :]
+        d2 = ((others - (circle.center.x, circle.center.y)) ** 2).sum(-1)
+        diff = np.abs(d2 - circle.r2)
+        close = (diff < 8 * ATOM) | (
+            diff <= 2 * REL_TOL * np.maximum(np.abs(d2), abs(circle.r2))
+        )
+        return [k + 1 + int(x) for x in np.nonzero(close)[0]]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
 from newclid.dependencies.dependency import Dependency
-from newclid.numerical import close_enough
+from newclid.numerical import close_enough, close_enough_array
 from newclid.numerical.geometries import CircleNum
 from newclid.predicates.congruence import Cong
 from newclid.predicates.cyclic import Cyclic
@@ -41,14 +43,18 @@ class Circumcenter(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        points: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, points: tuple[Point, ...]) -> bool:
         circle = CircleNum(points[0].num, points[0].num.distance(points[1].num))
         return all(
             close_enough(circle.radius, circle.center.distance(p.num))
             for p in points[2:]
         )
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        distance = np.sqrt(((xy[:, 1:] - xy[:, :1]) ** 2).sum(-1))
+        return close_enough_array(distance[:, :1], distance[:, 1:]).all(-1)
+
     @classmethod
     def check(cls, statement: Statement) -> bool:
         points: tuple[Point, ...] = statement.args
@@ -1,11 +1,13 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
+
 from matplotlib.axes import Axes
 from newclid.dependencies.dependency import NUMERICAL_CHECK, Dependency
 from newclid.dependencies.symbols import Line, Point
+from newclid.numerical import close_enough_array
 from newclid.numerical.draw_figure import draw_line
-from newclid.numerical.geometries import LineNum
 from newclid.predicates.predicate import Predicate
 from newclid.tools import notNone
 from numpy.random import Generator
@@ -35,11 +37,21 @@ class Coll(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        points: tuple[Point, ...] = tuple(statement.args)
-        line = LineNum(points[0].num, points[1].num)
+    def check_numerical_points(cls, points: tuple[Point, ...]) -> bool:
+        figure, (a, b) = points[0].symbols_graph.figure_indices(points[:2])
+        line = figure.line(a, b)
         return all(line.point_at(p.num.x, p.num.y) is not None for p in points[2:])
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        (x1, y1), (x2, y2) = xy[:, 0].T, xy[:, 1].T
+        a, b, c = y1 - y2, x2 - x1, x1 * y2 - x2 * y1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            norm = np.hypot(a, b)[:, None]
+            a, b, c = a[:, None] / norm, b[:, None] / norm, c[:, None] / norm
+            on_line = close_enough_array(a * xy[:, 2:, 0] + b * xy[:, 2:, 1], -c)
+        return on_line.all(-1)
+
     @classmethod
     def check(cls, statement: Statement) -> bool:
         return Line.check_coll(statement.args)
@@ -105,8 +117,8 @@ class NColl(Predicate):
         return Coll.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        return not Coll.check_numerical(statement)
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        return not Coll.check_numerical_points(args)
 
     @classmethod
     def check(cls, statement: Statement) -> bool:
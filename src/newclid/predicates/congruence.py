@@ -1,11 +1,13 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
+
 from matplotlib.axes import Axes
 from matplotlib.pylab import Generator
 
 from newclid.dependencies.symbols import Point
-from newclid.numerical import close_enough
+from newclid.numerical import close_enough, consecutive_close_enough
 from newclid.numerical.draw_figure import draw_segment
 from newclid.predicates.predicate import Predicate
 from newclid.algebraic_reasoning.tables import Ratio_Chase
@@ -53,16 +55,20 @@ class Cong(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, indices = args[0].symbols_graph.figure_indices(args)
         length = None
-        for a, b in reshape(list(args), 2):
-            _length = a.num.distance2(b.num)
+        for a, b in reshape(indices, 2):
+            _length = figure.distance2[a, b]
             if length is not None and not close_enough(length, _length):
                 return False
             length = _length
         return True
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        return consecutive_close_enough(((xy[:, 1::2] - xy[:, 0::2]) ** 2).sum(-1))
+
     @classmethod
     def _prep_ar(cls, statement: Statement) -> tuple[list[SumCV], Table]:
         points: tuple[Point, ...] = statement.args
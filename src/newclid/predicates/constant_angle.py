@@ -134,8 +134,7 @@ class ACompute(Predicate):
         return tuple(dep_graph.symbols_graph.names2points((a, b, c, d)))
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, Point, Point, Point] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c, d = args
         ang = ((c.num - d.num).angle() - (a.num - b.num).angle()) % pi
         if close_enough(ang, pi):
@@ -1,11 +1,12 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from newclid.dependencies.dependency import Dependency
 from newclid.dependencies.symbols import Circle, Point
-from newclid.numerical import close_enough
+from newclid.numerical import close_enough, close_enough_array
 from newclid.numerical.draw_figure import draw_circle
-from newclid.numerical.geometries import CircleNum
 from newclid.predicates.predicate import Predicate
 from matplotlib.axes import Axes
 from numpy.random import Generator
@@ -38,11 +39,10 @@ class Cyclic(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        points: tuple[Point, ...] = statement.args
-        try:
-            circle = CircleNum(p1=points[0].num, p2=points[1].num, p3=points[2].num)
-        except ValueError:
+    def check_numerical_points(cls, points: tuple[Point, ...]) -> bool:
+        figure, (a, b, c) = points[0].symbols_graph.figure_indices(points[:3])
+        circle = figure.circle(a, b, c)
+        if circle is None:
             return False
 
         return all(
@@ -50,6 +50,23 @@ class Cyclic(Predicate):
             for p in points[3:]
         )
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        (x1, y1), (x2, y2), (x3, y3) = xy[:, 0].T, xy[:, 1].T, xy[:, 2].T
+        n1, n2, n3 = x1**2 + y1**2, x2**2 + y2**2, x3**2 + y3**2
+        d = 2 * (x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            center = np.stack(
+                (
+                    (n1 * (y2 - y3) + n2 * (y3 - y1) + n3 * (y1 - y2)) / d,
+                    (n1 * (x3 - x2) + n2 * (x1 - x3) + n3 * (x2 - x1)) / d,
+                ),
+                axis=-1,
+            )[:, None]
+            r2 = ((xy[:, :1] - center) ** 2).sum(-1)
+            d2 = ((xy[:, 3:] - center) ** 2).sum(-1)
+            return close_enough_array(r2, d2).all(-1)
+
     @classmethod
     def check(cls, statement: Statement) -> bool:
         return Circle.check_cyclic(statement.args)
@@ -30,10 +30,10 @@ class Diff(Predicate):
         return tuple(dep_graph.symbols_graph.names2points(cls.preparse(args)))
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         p: Point
         q: Point
-        p, q = statement.args
+        p, q = args
         return not p.num.close_enough(q.num)
 
     @classmethod
@@ -5,7 +5,7 @@ from matplotlib.axes import Axes
 import numpy as np
 
 from newclid.dependencies.symbols import Line
-from newclid.numerical import close_enough
+from newclid.numerical import close_enough, consecutive_close_enough
 from newclid.numerical.draw_figure import PALETTE, draw_angle, draw_line
 from newclid.predicates.predicate import Predicate
 from newclid.algebraic_reasoning.tables import Angle_Chase
@@ -54,16 +54,25 @@ class EqAngle(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, indices = args[0].symbols_graph.figure_indices(args)
+        direction = figure.direction
         angle = None
-        for a, b, c, d in reshape(list(args), 4):
-            _angle = ((d.num - c.num).angle() - (b.num - a.num).angle()) % np.pi
+        for a, b, c, d in reshape(indices, 4):
+            _angle = (direction[c, d] - direction[a, b]) % np.pi
             if angle is not None and not close_enough(angle, _angle):
                 return False
             angle = _angle
         return True
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        vectors = xy[:, 1::2] - xy[:, 0::2]
+        direction = np.arctan2(vectors[..., 1], vectors[..., 0])
+        return consecutive_close_enough(
+            (direction[:, 1::2] - direction[:, 0::2]) % np.pi
+        )
+
     @classmethod
     def _prep_ar(cls, statement: Statement) -> tuple[list[SumCV], Table]:
         points: tuple[Point, ...] = statement.args
@@ -1,8 +1,10 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from newclid.dependencies.symbols import Point
-from newclid.numerical import close_enough
+from newclid.numerical import close_enough, consecutive_close_enough
 from newclid.predicates.equal_angles import EqAngle
 from newclid.predicates.predicate import Predicate
 from newclid.algebraic_reasoning.tables import Ratio_Chase
@@ -34,19 +36,23 @@ class EqRatio(Predicate):
         return EqAngle.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, indices = args[0].symbols_graph.figure_indices(args)
+        distance = figure.distance
         ratio = None
-        for a, b, c, d in reshape(statement.args, 4):
-            a: Point
-            b: Point
-            c: Point
-            d: Point
-            _ratio = a.num.distance(b.num) / c.num.distance(d.num)
+        for a, b, c, d in reshape(indices, 4):
+            _ratio = distance[a, b] / distance[c, d]
             if ratio is not None and not close_enough(ratio, _ratio):
                 return False
             ratio = _ratio
         return True
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        distance = np.sqrt(((xy[:, 1::2] - xy[:, 0::2]) ** 2).sum(-1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return consecutive_close_enough(distance[:, 0::2] / distance[:, 1::2])
+
     @classmethod
     def _prep_ar(cls, statement: Statement) -> tuple[list[SumCV], Table]:
         points: tuple[Point, ...] = statement.args
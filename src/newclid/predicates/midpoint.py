@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from newclid.dependencies.symbols import Point
+from newclid.numerical import close_enough_array
 from newclid.predicates.predicate import Predicate
 
 if TYPE_CHECKING:
@@ -33,11 +36,15 @@ class MidPoint(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         m, a, b = args
         return m.num.close_enough((a.num + b.num) / 2)
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        middle = (xy[:, 1] + xy[:, 2]) / 2
+        return close_enough_array(xy[:, 0], middle).all(-1)
+
     @classmethod
     def pretty(cls, statement: Statement) -> str:
         args: tuple[Point, ...] = statement.args
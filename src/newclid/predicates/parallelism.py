@@ -1,13 +1,13 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
+
 from matplotlib.axes import Axes
 from matplotlib.pylab import Generator
-import numpy as np
 from newclid.dependencies.symbols import Point
-from newclid.numerical import close_enough
+from newclid.numerical import close_enough, consecutive_close_enough
 from newclid.numerical.draw_figure import PALETTE, draw_segment, draw_segment_num
-from newclid.numerical.geometries import LineNum
 from newclid.predicates.congruence import Cong
 from newclid.predicates.predicate import Predicate
 from newclid.algebraic_reasoning.tables import Angle_Chase
@@ -39,16 +39,22 @@ class Para(Predicate):
         return Cong.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, indices = args[0].symbols_graph.figure_indices(args)
         angle = None
-        for a, b in reshape(list(args), 2):
-            _angle = (b.num - a.num).angle() % np.pi
+        for a, b in reshape(indices, 2):
+            _angle = figure.direction[a, b]
             if angle is not None and not close_enough(angle, _angle):
                 return False
             angle = _angle
         return True
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        vectors = xy[:, 1::2] - xy[:, 0::2]
+        direction = np.arctan2(vectors[..., 1], vectors[..., 0]) % np.pi
+        return consecutive_close_enough(direction)
+
     @classmethod
     def _prep_ar(cls, statement: Statement) -> tuple[list[SumCV], Table]:
         points: tuple[Point, ...] = statement.args
@@ -156,12 +162,9 @@ class NPara(Predicate):
         return Para.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
-        a, b, c, d = args
-        l1 = LineNum(a.num, b.num)
-        l2 = LineNum(c.num, d.num)
-        return not l1.is_parallel(l2)
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, (a, b, c, d) = args[0].symbols_graph.figure_indices(args)
+        return not figure.line(a, b).is_parallel(figure.line(c, d))
 
     @classmethod
     def check(cls, statement: Statement) -> bool:
@@ -1,10 +1,12 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
+
 from matplotlib.axes import Axes
 
 from newclid.dependencies.symbols import Line, Point
-from newclid.numerical import nearly_zero
+from newclid.numerical import ATOM, nearly_zero
 from newclid.numerical.draw_figure import draw_line, draw_rectangle
 from newclid.predicates.equal_angles import EqAngle
 from newclid.predicates.predicate import Predicate
@@ -47,11 +49,15 @@ class Perp(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c, d = args
         return nearly_zero((a.num - b.num).dot(c.num - d.num))
 
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> np.ndarray:
+        dot = ((xy[:, 0] - xy[:, 1]) * (xy[:, 2] - xy[:, 3])).sum(-1)
+        return np.abs(dot) < 2 * ATOM
+
     @classmethod
     def _prep_ar(cls, statement: Statement) -> tuple[list[SumCV], Table]:
         points: tuple[Point, ...] = statement.args
@@ -146,8 +152,8 @@ class NPerp(Predicate):
         return Perp.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        return not Perp.check_numerical(statement)
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        return not Perp.check_numerical_points(args)
 
     @classmethod
     def check(cls, statement: Statement) -> bool:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import ABC
 from typing import TYPE_CHECKING, Any, Optional
+import numpy as np
 from numpy.random import Generator
 
 
@@ -8,6 +9,7 @@ if TYPE_CHECKING:
     from matplotlib.axes import Axes
     from newclid.dependencies.dependency import Dependency
     from newclid.dependencies.dependency_graph import DependencyGraph
+    from newclid.dependencies.symbols import Point
     from newclid.statement import Statement
 
 
@@ -31,7 +33,27 @@ class Predicate(ABC):
 
     @classmethod
     def check_numerical(cls, statement: Statement) -> bool:
-        raise NotImplementedError(f"{cls.NAME} check_numerical not implemented")
+        res = cls.check_numerical_points(statement.args)
+        if res is None:
+            raise NotImplementedError(f"{cls.NAME} check_numerical not implemented")
+        return res
+
+    @classmethod
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> Optional[bool]:
+        """
+        Numerical check on the parsed points `names2points(preparse(args))`,
+        without building the statement. None if the predicate needs the statement.
+        """
+        return None
+
+    @classmethod
+    def check_numerical_coordinates(cls, xy: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Numerical check on the coordinates of the parsed points in several
+        configurations, of shape (configurations, points, 2).
+        Returns whether it holds in each configuration, None if not vectorized.
+        """
+        return None
 
     @classmethod
     def check(cls, statement: Statement) -> bool:
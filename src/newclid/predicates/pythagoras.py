@@ -44,8 +44,7 @@ class PythagoreanPremises(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c = args
         return close_enough(abs((a.num - b.num).dot(a.num - c.num)), 0)
 
@@ -109,8 +108,8 @@ class PythagoreanConclusions(Predicate):
         return PythagoreanPremises.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        return PythagoreanPremises.check_numerical(statement)
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        return PythagoreanPremises.check_numerical_points(args)
 
     @classmethod
     def add(cls, dep: Dependency):
@@ -37,8 +37,7 @@ class SameClock(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c, x, y, z = args
         return same_clock(a.num, b.num, c.num, x.num, y.num, z.num)
 
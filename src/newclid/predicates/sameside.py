@@ -39,8 +39,7 @@ class SameSide(Predicate):
         )
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c, x, y, z = args
         sa = sign((b.num - a.num).dot(c.num - a.num))
         sz = sign((y.num - x.num).dot(z.num - x.num))
@@ -80,8 +79,8 @@ class NSameSide(Predicate):
         return SameSide.parse(args, dep_graph)
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        return not SameSide.check_numerical(statement)
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        return not SameSide.check_numerical_points(args)
 
     @classmethod
     def check(cls, statement: Statement) -> bool:
@@ -9,7 +9,6 @@ from newclid.predicates.triangles_similar import two_triangles
 
 if TYPE_CHECKING:
     from newclid.dependencies.dependency_graph import DependencyGraph
-    from newclid.statement import Statement
 
 
 class ContriClock(Predicate):
@@ -36,8 +35,7 @@ class ContriClock(Predicate):
         return tuple(dep_graph.symbols_graph.names2points(twot)) if twot else None
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c, p, q, r = args
         return (
             close_enough(a.num.distance(b.num), p.num.distance(q.num))
@@ -75,8 +73,7 @@ class ContriReflect(Predicate):
         return tuple(dep_graph.symbols_graph.names2points(twot)) if twot else None
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
         a, b, c, p, q, r = args
         return (
             close_enough(a.num.distance(b.num), p.num.distance(q.num))
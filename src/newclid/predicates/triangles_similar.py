@@ -49,15 +49,17 @@ class SimtriClock(Predicate):
         return tuple(dep_graph.symbols_graph.names2points(twot)) if twot else None
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, (a, b, c, p, q, r) = args[0].symbols_graph.figure_indices(args)
+        distance = figure.distance
+        k = distance[p, q] / distance[a, b]
+        if not (
+            close_enough(distance[a, c] * k, distance[p, r])
+            and close_enough(distance[b, c] * k, distance[q, r])
+        ):
+            return False
         a, b, c, p, q, r = args
-        k = p.num.distance(q.num) / a.num.distance(b.num)
-        return (
-            close_enough(a.num.distance(c.num) * k, p.num.distance(r.num))
-            and close_enough(b.num.distance(c.num) * k, q.num.distance(r.num))
-            and same_clock(a.num, b.num, c.num, p.num, q.num, r.num)
-        )
+        return same_clock(a.num, b.num, c.num, p.num, q.num, r.num)
 
     @classmethod
     def to_tokens(cls, args: tuple[Any, ...]) -> tuple[str, ...]:
@@ -105,15 +107,17 @@ class SimtriReflect(Predicate):
         return tuple(dep_graph.symbols_graph.names2points(twot)) if twot else None
 
     @classmethod
-    def check_numerical(cls, statement: Statement) -> bool:
-        args: tuple[Point, ...] = statement.args
+    def check_numerical_points(cls, args: tuple[Point, ...]) -> bool:
+        figure, (a, b, c, p, q, r) = args[0].symbols_graph.figure_indices(args)
+        distance = figure.distance
+        k = distance[p, q] / distance[a, b]
+        if not (
+            close_enough(distance[a, c] * k, distance[p, r])
+            and close_enough(distance[b, c] * k, distance[q, r])
+        ):
+            return False
         a, b, c, p, q, r = args
-        k = p.num.distance(q.num) / a.num.distance(b.num)
-        return (
-            close_enough(a.num.distance(c.num) * k, p.num.distance(r.num))
-            and close_enough(b.num.distance(c.num) * k, q.num.distance(r.num))
-            and same_clock(a.num, b.num, c.num, p.num, r.num, q.num)
-        )
+        return same_clock(a.num, b.num, c.num, p.num, r.num, q.num)
 
     @classmethod
     def to_tokens(cls, args: tuple[Any, ...]) -> tuple[str, ...]:
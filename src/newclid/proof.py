@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import copy
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Optional, Sequence, Union
 import logging
 
 from matplotlib import patches
 
+from newclid.checkpoint import pickle_copy
 from newclid.formulations.clause import Clause, translate_sentence
 from newclid.dependencies.dependency_graph import DependencyGraph
 from newclid.dependencies.symbols import Point
@@ -15,6 +18,7 @@ from newclid.numerical.draw_figure import init_figure
 from newclid.numerical.geometries import (
     InvalidIntersectError,
     InvalidReduceError,
+    InvalidSampleError,
     ObjNum,
     PointNum,
     reduce,
@@ -24,20 +28,31 @@ from newclid.algebraic_reasoning.algebraic_manipulator import (
 )
 from newclid.statement import Statement
 from newclid.formulations.definition import DefinitionJGEX
+from newclid.instrumentation import INSTRUMENTATION, count
 from newclid.match_theorems import Matcher
 
 from newclid.numerical.distances import (
+    PointSetStatistics,
     PointTooCloseError,
     PointTooFarError,
-    check_too_far_numerical,
-    check_too_close_numerical,
+)
+from newclid.numerical.configurations import (
+    NumericalConfiguration,
+    configuration_key,
+    load_configuration,
+    save_configuration,
 )
 from newclid.numerical.sketch import sketch
 
 from newclid.formulations.problem import ProblemJGEX
 from newclid.dependencies.dependency import IN_PREMISES, Dependency
 from newclid.formulations.rule import Rule
-from newclid.tools import atomize, notNone, runtime_cache_path
+from newclid.tools import (
+    atomize,
+    notNone,
+    numerical_cache_path,
+    runtime_cache_path,
+)
 
 if TYPE_CHECKING:
     from numpy.random import Generator
@@ -49,6 +64,10 @@ class ConstructionError(Exception):
     pass
 
 
+# consecutive failures of a clause before resampling the previous ones.
+CLAUSE_ATTEMPTS = 10
+
+
 class ProofState:
     """Object representing the proof state."""
 
@@ -61,10 +80,16 @@ class ProofState:
         goals: Optional[list[Statement]] = None,
         defs: dict[str, DefinitionJGEX],
         draw_figure: bool = True,
+        cache_budget: Optional[int] = None,
     ):
-        self.dep_graph = dep_graph or DependencyGraph(AlgebraicManipulator())
+        self.dep_graph = dep_graph or DependencyGraph(
+            AlgebraicManipulator(), cache_budget=cache_budget
+        )
         self.symbols_graph = self.dep_graph.symbols_graph
-        self.goals: list[Statement] = goals or []
+        self.point_statistics = PointSetStatistics(
+            p.num for p in self.symbols_graph.nodes_of_type(Point)
+        )
+        self.goals = goals or []
         self.rng = rng
 
         self.problem_path = problem_path
@@ -74,9 +99,41 @@ class ProofState:
         self.fig = init_figure() if draw_figure else None
         self.defs = defs
 
-    def add_construction(self, construction: Clause):
-        """Add a new clause of construction, e.g. a new excenter."""
-        adds: list[Dependency] = []
+    def fork(self, rng: Optional["Generator"] = None) -> ProofState:
+        """Independent child of the proof state, e.g. to try an auxiliary construction.
+
+        The child starts with every statement, symbol, AR table and matcher cache
+        of the parent and can be extended with `add_construction` and run further
+        without changing the parent. The construction definitions are shared,
+        the figure is not drawn on. Without `rng`, the child gets a copy of the
+        random generator of the parent.
+        """
+        state = copy.copy(self)
+        state.defs = {}
+        state.fig = None
+        child = pickle_copy(state)
+        child.defs = self.defs
+        if rng is not None:
+            child.rng = rng
+            child.matcher.rng = rng
+        return child
+
+    def add_construction(
+        self,
+        construction: Clause,
+        positions: Optional[Sequence[PointNum]] = None,
+    ) -> tuple[PointNum, ...]:
+        """Add a new clause of construction, e.g. a new excenter.
+
+        The new points are placed at the given positions, or sampled otherwise.
+        Sampling failures are raised before the proof state is modified,
+        only a basic statement not holding numerically raises after the new
+        points are created.
+
+        Returns:
+            The numerical positions of the new points.
+        """
+        basics: list[tuple[str, ...]] = []
         numerics: list[tuple[str, ...]] = []
         existing_points = list(self.symbols_graph.nodes_of_type(Point))
 
@@ -92,25 +149,21 @@ class ProofState:
                     zip(cdef.declare[1:], construction.points + constr_sentence[1:])
                 )
 
-            for premise in cdef.require.sentences:
-                if len(premise) == 0:
-                    continue
-                statement = notNone(
-                    Statement.from_tokens(
-                        translate_sentence(mapping, premise), self.dep_graph
-                    )
-                )
-                if not statement.check_numerical():
-                    raise ConstructionError(construction)
-
-            for bs in cdef.basics:
-                for t in bs.sentences:
+            if positions is None:
+                for premise in cdef.require.sentences:
+                    if len(premise) == 0:
+                        continue
                     statement = notNone(
                         Statement.from_tokens(
-                            translate_sentence(mapping, t), self.dep_graph
+                            translate_sentence(mapping, premise), self.dep_graph
                         )
                     )
-                    adds.append(Dependency.mk(statement, IN_PREMISES, ()))
+                    if not statement.check_numerical():
+                        raise ConstructionError(construction)
+
+            for bs in cdef.basics:
+                for t in bs.sentences:
+                    basics.append(translate_sentence(mapping, t))
             for n in cdef.numerics:
                 numerics.append(tuple(mapping[a] if a in mapping else a for a in n))
 
@@ -125,9 +178,8 @@ class ProofState:
             else:
                 point_names.append(s)
                 fix_point_postions.append(None)
-        new_points = self.symbols_graph.names2points(point_names)
-        for p in new_points:
-            if p in existing_points:
+        for name in point_names:
+            if name in self.symbols_graph.name2node:
                 raise Exception("The construction is illegal")
 
         # draw
@@ -143,19 +195,25 @@ class ProofState:
                 to_be_intersected += sketch(n[0], tuple(args), self.rng)
 
             return reduce(
-                to_be_intersected, [p.num for p in existing_points], rng=self.rng
+                to_be_intersected,
+                [p.num for p in existing_points],
+                rng=self.rng,
+                valid=self.point_statistics.within_bounds,
             )
 
-        new_numerical_point = draw_fn()
-        for p, num, num0 in zip(new_points, new_numerical_point, fix_point_postions):
-            p.num = num0 or num
+        if positions is None:
+            new_numerical_point = draw_fn()
+            self.point_statistics.check(new_numerical_point)
+            positions = tuple(
+                num0 or num
+                for num, num0 in zip(new_numerical_point, fix_point_postions)
+            )
 
-        # check two things
-        existing_numerical_points = [p.num for p in existing_points]
-        if check_too_close_numerical(new_numerical_point, existing_numerical_points):
-            raise PointTooCloseError()
-        if check_too_far_numerical(new_numerical_point, existing_numerical_points):
-            raise PointTooFarError()
+        new_points = self.symbols_graph.names2points(point_names)
+        for p, num in zip(new_points, positions):
+            p.num = num
+        self.symbols_graph.extend_figure(new_points)
+        self.point_statistics.add(positions)
 
         # draw some specific figures (to be refactored, if there are multiple branches)
         if self.fig is not None:
@@ -170,14 +228,25 @@ class ProofState:
                     closed=True,
                 )
                 ax.add_artist(triangle)
+        adds = [
+            Dependency.mk(
+                notNone(Statement.from_tokens(tokens, self.dep_graph)),
+                IN_PREMISES,
+                (),
+            )
+            for tokens in basics
+        ]
         for add in adds:
             if not add.statement.check_numerical():
                 raise ConstructionError(
                     "This is probably because the construction itself is wrong"
                 )
+        for add in adds:
             add.add()
 
-        self.matcher.update()
+        # Matches on the previous points stay valid, only the new points are matched.
+        self.matcher.update(keep_cache=True)
+        return tuple(positions)
 
     @classmethod
     def build_problemJGEX(
@@ -189,71 +258,231 @@ class ProofState:
         *,
         rng: "Generator",
         draw_figure: bool,
+        cache_budget: Optional[int] = None,
+        clause_attempts: int = CLAUSE_ATTEMPTS,
+        seed: Optional[int] = None,
+        configurations: int = 1,
     ) -> ProofState:
-        """Build a problem into a Proof state object."""
+        """Build a problem into a Proof state object.
+
+        Clauses are sampled one after the other, keeping the positions of the
+        clauses already sampled. A failing clause is sampled again, up to
+        `clause_attempts` times in a row if it drew random numbers and was only too
+        close or too far from the previous points, or only drew such candidates.
+        Then the last sampled clauses are dropped to be resampled, up to one clause
+        drawing random numbers the first time, then twice as many each time until a
+        clause further than before is sampled or all clauses are dropped. Clauses whose failures were not
+        solved before dropping all clauses drop all clauses directly afterwards.
+        Every failure, and every sampling whose goals do not hold numerically,
+        counts as one of the `max_attempts`.
+
+        With a `problem_path` and a `seed`, the accepted positions are saved in the
+        numerical cache of the problem and reloaded by later builds of the same
+        problem, definitions and seed, which then skip sampling and numerical checks.
+
+        With several `configurations`, other configurations satisfying the goals are
+        sampled independently and kept by the symbols graph, so that vectorized
+        numerical checks only hold if they hold in every configuration.
+        """
         LOGGER.info(
             f"Building proof state from problem '{problemJGEX.name}': {problemJGEX}"
         )
-
-        err = ConstructionError(f"Construction failed {max_attempts} times")
-        for _ in range(max_attempts):
-            # Search for coordinates that checks premises conditions numerically.
-            try:
-                proof = ProofState(rng=rng, defs=defsJGEX, draw_figure=draw_figure)
-                for construction in problemJGEX.constructions:
-                    proof.add_construction(construction)
-                if problem_path:
-                    proof.problem_path = problem_path
-                    proof.matcher.update(runtime_cache_path(problem_path))
-
-            except (
-                InvalidIntersectError,
-                InvalidReduceError,
-                ConstructionError,
-                PointTooCloseError,
-                PointTooFarError,
-            ) as e:
-                err = e
-                continue
-
-            if not problemJGEX.goals:
-                break
-
-            all_check = True
+        constructions = problemJGEX.constructions
+
+        def replay(sampled: list[tuple[PointNum, ...]]) -> ProofState:
+            proof = ProofState(
+                rng=rng,
+                defs=defsJGEX,
+                draw_figure=draw_figure,
+                cache_budget=cache_budget,
+            )
+            for construction, positions in zip(constructions, sampled):
+                proof.add_construction(construction, positions)
+            return proof
+
+        def with_goals(proof: ProofState) -> ProofState:
+            if problem_path:
+                proof.problem_path = problem_path
+                proof.matcher.update(runtime_cache_path(problem_path))
             proof.goals = [
                 notNone(Statement.from_tokens(goal, proof.dep_graph))
                 for goal in problemJGEX.goals
             ]
-            for goal in proof.goals:
-                if not goal.check_numerical():
-                    all_check = False
-                    break
-            if all_check:
+            return proof
+
+        def with_configurations(proof: ProofState) -> ProofState:
+            others = [
+                cls.build_problemJGEX(
+                    problemJGEX,
+                    defsJGEX,
+                    None,
+                    max_attempts,
+                    rng=rng,
+                    draw_figure=False,
+                    clause_attempts=clause_attempts,
+                ).symbols_graph.name2node
+                for _ in range(configurations - 1)
+            ]
+            if others:
+                proof.symbols_graph.set_configurations(
+                    [
+                        {
+                            name: node.num
+                            for name, node in other.items()
+                            if isinstance(node, Point)
+                        }
+                        for other in others
+                    ]
+                )
+                proof.dep_graph.check_numerical.clear()
+            return proof
+
+        cache_path = numerical_cache_path(problem_path)
+        key = configuration_key(problemJGEX, defsJGEX, seed) if seed is not None else ""
+        if cache_path is not None and key:
+            saved = load_configuration(cache_path, key, constructions)
+            if saved is not None:
+                try:
+                    proof = replay(saved.positions)
+                except ConstructionError:
+                    LOGGER.info(f"Numerical configuration in {cache_path} is stale")
+                else:
+                    LOGGER.info(f"Numerical configuration loaded from {cache_path}")
+                    rng.bit_generator.state = saved.rng_state
+                    return with_configurations(with_goals(proof))
+
+        err = ConstructionError(f"Construction failed {max_attempts} times")
+        attempts = 0
+        # Clauses for which backtracking did not help, restarting from scratch instead.
+        restarting: set[int] = set()
+        while attempts < max_attempts:
+            # Search for coordinates that checks premises conditions numerically.
+            proof = replay([])
+            sampled: list[tuple[PointNum, ...]] = []
+            # Whether sampling each clause drew random numbers.
+            randomized: list[bool] = []
+            failures = 0
+            furthest = 0
+            levels = 1
+            while len(sampled) < len(constructions) and attempts < max_attempts:
+                n_points = len(proof.symbols_graph.nodes_of_type(Point))
+                rng_state = rng.bit_generator.state
+                try:
+                    sampled.append(proof.add_construction(constructions[len(sampled)]))
+                    randomized.append(rng.bit_generator.state != rng_state)
+                    failures = 0
+                    if len(sampled) > furthest:
+                        furthest = len(sampled)
+                        levels = 1
+                    continue
+                except (
+                    InvalidIntersectError,
+                    InvalidReduceError,
+                    ConstructionError,
+                ) as e:
+                    # Mostly determined by the clauses already sampled.
+                    err = e
+                    failures = clause_attempts
+                except (
+                    PointTooCloseError,
+                    PointTooFarError,
+                    InvalidSampleError,
+                ) as e:
+                    err = e
+                    if rng.bit_generator.state != rng_state:
+                        failures += 1
+                    else:
+                        failures = clause_attempts
+                attempts += 1
+                if INSTRUMENTATION.enabled:
+                    count("build.retry")
+                modified = len(proof.symbols_graph.nodes_of_type(Point)) > n_points
+                if failures >= clause_attempts and sampled:
+                    failing = len(sampled)
+                    if failing in restarting:
+                        levels = failing
+                    LOGGER.debug(f"Backtracking {levels} clauses from clause {failing}")
+                    if INSTRUMENTATION.enabled:
+                        count("build.backtrack")
+                    dropped = 0
+                    while sampled and dropped < levels:
+                        sampled.pop()
+                        dropped += randomized.pop()
+                    failures = 0
+                    levels *= 2
+                    if not sampled:
+                        restarting.add(failing)
+                        furthest = 0
+                        levels = 1
+                    modified = True
+                if modified:
+                    proof = replay(sampled)
+            if len(sampled) < len(constructions):
                 break
 
-        else:
-            raise Exception(f"Build failed too many times, last error: {repr(err)}")
+            proof = with_goals(proof)
+            if all(goal.check_numerical() for goal in proof.goals):
+                if cache_path is not None and key:
+                    save_configuration(
+                        cache_path,
+                        key,
+                        NumericalConfiguration(sampled, rng.bit_generator.state),
+                    )
+                return with_configurations(proof)
+            attempts += 1
+            if INSTRUMENTATION.enabled:
+                count("build.retry")
 
-        return proof
+        raise ConstructionError(
+            f"Build failed too many times, last error: {repr(err)}"
+        ) from err
 
     def match_theorem(self, theorem: Rule) -> list[Dependency]:
         return list(self.matcher.match_theorem(theorem))
 
+    def rule_applications(self, theorem: Rule) -> tuple[Dependency, ...]:
+        """Numerically valid applications of the theorem, whether their premises are proven or not."""
+        return self.matcher.cached_dependencies(theorem)
+
     def apply_dep(self, dep: Dependency) -> bool:
         """Add the dependency to the proof dependency graph.
 
         Returns:
             True if the statment is a new one, false otherwise.
         """
-        if dep.statement in dep.statement.dep_graph.hyper_graph:
-            return False
-        dep.add()
-        return True
+        start_time = time.perf_counter()
+        new = dep.statement not in dep.statement.dep_graph.hyper_graph
+        if new:
+            dep.add()
+        # Only the applications of matched rules are counted.
+        stats = self.matcher.rule_stats.get(dep.reason)
+        if stats is not None:
+            stats.applied += 1
+            stats.new_facts += new
+            stats.apply_time += time.perf_counter() - start_time
+        return new
+
+    @property
+    def goals(self) -> list[Statement]:
+        return self._goals
+
+    @goals.setter
+    def goals(self, goals: list[Statement]) -> None:
+        self._goals = goals
+        self._unproven_goals = list(goals)
+        self._goals_checked_at = -1
 
     def check_goals(self) -> bool:
+        """Whether all goals are proven.
+
+        The goals not proven yet are only checked again
+        once dependencies have been added since their last check.
+        """
         if not self.goals:
             return False
-        for goal in self.goals:
-            if not goal.check():
-                return False
-        return True
+        if self._goals_checked_at != self.dep_graph.added:
+            self._goals_checked_at = self.dep_graph.added
+            self._unproven_goals = [
+                goal for goal in self._unproven_goals if not goal.check()
+            ]
+        return not self._unproven_goals
@@ -0,0 +1,171 @@
+"""Static goal-relevance analysis of the rules of a problem.
+
+Rules are linked by predicates, from the predicates of their premises to the
+predicates of their conclusions. Statements of a predicate can only hold if they
+are premises of the problem, checked numerically, concluded by a rule, or
+deduced by AR from statements of the same table.
+
+Rules with a premise predicate that can never hold are unreachable, and rules
+whose conclusions can never contribute to a goal are irrelevant.
+Both can be dropped before the deductive agent runs without losing any proof.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from newclid.predicates import NUMERICAL_PREDICATES
+
+if TYPE_CHECKING:
+    from newclid.formulations.rule import Rule
+    from newclid.proof import ProofState
+
+
+class _ARTable(NamedTuple):
+    sources: frozenset[str]
+    """Predicates whose statements are added to the table."""
+    checked: frozenset[str]
+    """Predicates whose statements may be checked from the table."""
+
+
+AR_TABLES: tuple[_ARTable, ...] = (
+    _ARTable(
+        sources=frozenset(
+            ("coll", "para", "perp", "eqangle", "aconst", "PythagoreanConclusions")
+        ),
+        checked=frozenset(
+            ("para", "perp", "eqangle", "aconst", "acompute", "PythagoreanPremises")
+        ),
+    ),
+    _ARTable(
+        sources=frozenset(
+            (
+                "cong",
+                "eqratio",
+                "eqratio3",
+                "rconst",
+                "lconst",
+                "circle",
+                "PythagoreanConclusions",
+            )
+        ),
+        checked=frozenset(
+            (
+                "cong",
+                "eqratio",
+                "eqratio3",
+                "rconst",
+                "lconst",
+                "circle",
+                "rcompute",
+                "lcompute",
+                "PythagoreanPremises",
+            )
+        ),
+    ),
+)
+
+ADDED_WITH: dict[str, frozenset[str]] = {
+    "circle": frozenset(("cong", "cyclic")),
+    "eqratio3": frozenset(("eqratio",)),
+    "PythagoreanConclusions": frozenset(("perp", "lconst")),
+}
+"""Predicates of the statements added along with statements of a predicate."""
+
+ALWAYS_CHECKED = frozenset(predicate.NAME for predicate in NUMERICAL_PREDICATES)
+"""Predicates of statements checked numerically, that never need a proof."""
+
+
+class RulePruning(NamedTuple):
+    kept: list[Rule]
+    unreachable: list[Rule]
+    irrelevant: list[Rule]
+
+    def infos(self) -> dict[str, list[str]]:
+        return {
+            "unreachable": [rule.descrption for rule in self.unreachable],
+            "irrelevant": [rule.descrption for rule in self.irrelevant],
+        }
+
+
+def _premise_predicates(rule: Rule) -> set[str]:
+    return {premise[0] for premise in rule.premises}
+
+
+def _conclusion_predicates(rule: Rule) -> set[str]:
+    predicates = {conclusion[0] for conclusion in rule.conclusions}
+    for name in list(predicates):
+        predicates |= ADDED_WITH.get(name, frozenset())
+    return predicates
+
+
+def _holding(predicates: set[str]) -> set[str]:
+    """The predicates and the ones AR may check from them."""
+    holding = set(predicates)
+    for table in AR_TABLES:
+        if table.sources & predicates:
+            holding |= table.checked
+    return holding
+
+
+def _contributing(predicates: set[str]) -> set[str]:
+    """The predicates and the ones AR may combine into them."""
+    contributing = set(predicates)
+    for table in AR_TABLES:
+        if table.checked & predicates:
+            contributing |= table.sources
+    return contributing
+
+
+def prune_rules(
+    rules: list[Rule], premises: Iterable[str], goals: Iterable[str]
+) -> RulePruning:
+    """Split the rules by whether they may help to prove the goals from the premises.
+
+    Args:
+        rules: The rules to prune, kept in the same order.
+        premises: The predicates of the statements given by the problem.
+        goals: The predicates of the goals, every reachable rule is kept if empty.
+    """
+    holding = _holding(set(premises) | ALWAYS_CHECKED)
+    reachable: list[Rule] = []
+    remaining = list(rules)
+    changed = True
+    while changed:
+        changed = False
+        for rule in list(remaining):
+            if _premise_predicates(rule) <= holding:
+                reachable.append(rule)
+                remaining.remove(rule)
+                holding = _holding(holding | _conclusion_predicates(rule))
+                changed = True
+    unreachable = [rule for rule in rules if rule in remaining]
+
+    needed = _contributing(set(goals))
+    relevant: set[Rule] = set(reachable)
+    if needed:
+        relevant = set()
+        changed = True
+        while changed:
+            changed = False
+            for rule in reachable:
+                if rule in relevant or not _conclusion_predicates(rule) & needed:
+                    continue
+                relevant.add(rule)
+                needed = _contributing(needed | _premise_predicates(rule))
+                changed = True
+    return RulePruning(
+        kept=[rule for rule in rules if rule in relevant],
+        unreachable=unreachable,
+        irrelevant=[
+            rule for rule in rules if rule in reachable and rule not in relevant
+        ],
+    )
+
+
+def prune_rules_of_proof(rules: list[Rule], proof: ProofState) -> RulePruning:
+    """Prune the rules for the statements and goals of the proof before it runs."""
+    return prune_rules(
+        rules,
+        premises=(s.predicate.NAME for s in proof.dep_graph.hyper_graph),
+        goals=(goal.predicate.NAME for goal in proof.goals),
+    )
@@ -0,0 +1,70 @@
+"""Per-rule counters of the work done matching and applying rules."""
+
+from __future__ import annotations
+from typing import Any, Mapping
+
+RULE_STATS_COLUMNS = (
+    "mappings",
+    "numerical_passes",
+    "cached",
+    "applied",
+    "new_facts",
+    "match_time",
+    "apply_time",
+)
+
+
+class RuleStats:
+    """Work done on a rule since the proof state was built."""
+
+    def __init__(self) -> None:
+        self.mappings = 0
+        """Candidate assignments of points to the variables of the rule tried."""
+        self.numerical_passes = 0
+        """Candidate assignments for which every premise holds numerically."""
+        self.cached = 0
+        """Applications of the rule cached by the matcher."""
+        self.applied = 0
+        """Applications of the rule given to the proof by the agents."""
+        self.new_facts = 0
+        """Applications of the rule that added a new statement to the proof."""
+        self.match_time = 0.0
+        """Seconds spent matching the rule and checking the premises of its applications."""
+        self.apply_time = 0.0
+        """Seconds spent adding its applications to the proof."""
+
+    def as_dict(self) -> dict[str, Any]:
+        return {column: getattr(self, column) for column in RULE_STATS_COLUMNS}
+
+
+def format_rule_stats(
+    stats: Mapping[str, Mapping[str, Any]],
+    sort_by: str = "match_time",
+    descending: bool = True,
+) -> str:
+    """Table of the rule stats, one rule per line, sorted by one of the columns."""
+    if sort_by not in RULE_STATS_COLUMNS:
+        raise ValueError(
+            f"Cannot sort rule stats by {sort_by}, choose from {RULE_STATS_COLUMNS}"
+        )
+    rows = sorted(stats.items(), key=lambda item: item[1][sort_by], reverse=descending)
+    name_width = max([len("rule")] + [len(name) for name in stats])
+    widths = [max(len(column), 10) for column in RULE_STATS_COLUMNS]
+    lines = [
+        "  ".join(
+            ["rule".ljust(name_width)]
+            + [column.rjust(width) for column, width in zip(RULE_STATS_COLUMNS, widths)]
+        )
+    ]
+    for name, row in rows:
+        cells = [
+            f"{row[column]:.3f}" if isinstance(row[column], float) else str(row[column])
+            for column in RULE_STATS_COLUMNS
+        ]
+        lines.append(
+            "  ".join(
+                [name.ljust(name_width)]
+                + [cell.rjust(width) for cell, width in zip(cells, widths)]
+            )
+        )
+    return "\n".join(lines)
@@ -1,7 +1,12 @@
 from __future__ import annotations
+import logging
+import pickle
+import sys
 import time
-from typing import TYPE_CHECKING, Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
 
+from newclid.checkpoint import Checkpoint, save_checkpoint
 from newclid.formulations.rule import Rule
 
 
@@ -9,27 +14,128 @@ if TYPE_CHECKING:
     from newclid.agent.agents_interface import DeductiveAgent
     from newclid.proof import ProofState
 
+LOGGER = logging.getLogger(__name__)
+
+
+class RunBudget(NamedTuple):
+    """Limits after which the run stops before the agent exhausts, None for no limit."""
+
+    timeout: Optional[float] = None
+    """Wall-clock seconds."""
+    max_steps: Optional[int] = None
+    """Steps of the deductive agent."""
+    max_facts: Optional[int] = None
+    """Dependencies added to the proof during the run."""
+    max_rss_mb: Optional[float] = None
+    """Peak resident set size of the process in MiB, ignored where unavailable."""
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process in MiB, None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in KiB elsewhere.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def exceeded_budget(
+    budget: RunBudget, elapsed: float, steps: int, facts: int
+) -> Optional[str]:
+    """Name of the first limit of the budget reached, None if within it."""
+    if budget.timeout is not None and elapsed >= budget.timeout:
+        return "timeout"
+    if budget.max_steps is not None and steps >= budget.max_steps:
+        return "max_steps"
+    if budget.max_facts is not None and facts >= budget.max_facts:
+        return "max_facts"
+    if budget.max_rss_mb is not None:
+        rss = peak_rss_mb()
+        if rss is not None and rss >= budget.max_rss_mb:
+            return "max_rss_mb"
+    return None
+
 
 def run_loop(
-    deductive_agent: "DeductiveAgent", proof: "ProofState", rules: list[Rule]
+    deductive_agent: "DeductiveAgent",
+    proof: "ProofState",
+    rules: list[Rule],
+    budget: Optional[RunBudget] = None,
+    checkpoint_path: Optional[Path] = None,
+    checkpoint_interval: float = 600.0,
+    resumed: Optional[Checkpoint] = None,
 ) -> dict[str, Any]:
-    """Run DeductiveAgent until saturation or goal found."""
+    """Run DeductiveAgent until saturation, goal found or budget reached.
+
+    Limits of the budget are checked between steps of the agent. Once one is
+    reached the run stops, and the infos report which limit stopped it
+    along with partial results.
+
+    With a `checkpoint_path`, the run is checkpointed every `checkpoint_interval`
+    seconds and when stopped by the budget. A run `resumed` from a checkpoint of
+    the same proof, rules and agent counts its steps, runtime and budget from
+    the start of the checkpointed run.
+    """
     infos: dict[str, Any] = {}
     for goal in proof.goals:
         if not goal.check_numerical():
             infos["error"] = f"{goal.pretty()} fails numerical check"
             return infos
     t0 = time.time()
-
     step = 0
+    added_before = proof.dep_graph.added
+    if resumed is not None:
+        t0 -= resumed.runtime
+        step = resumed.steps
+        added_before = resumed.added_before_run
+
+    def checkpoint() -> None:
+        nonlocal checkpoint_path
+        assert checkpoint_path is not None
+        try:
+            save_checkpoint(
+                checkpoint_path,
+                Checkpoint(
+                    proof, rules, deductive_agent, step, time.time() - t0, added_before
+                ),
+            )
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            LOGGER.warning(f"Checkpoints disabled, the run cannot be pickled: {e!r}")
+            checkpoint_path = None
+
+    last_checkpoint = time.time()
     running = True
     while running:
         running = deductive_agent.step(proof=proof, rules=rules)
         step += 1
+        if running and budget is not None:
+            stopped_by = exceeded_budget(
+                budget, time.time() - t0, step, proof.dep_graph.added - added_before
+            )
+            if stopped_by is not None:
+                LOGGER.info(f"Run stopped by {stopped_by} after {step} steps")
+                infos["stopped_by"] = stopped_by
+                if checkpoint_path is not None:
+                    checkpoint()
+                break
+        if (
+            running
+            and checkpoint_path is not None
+            and time.time() - last_checkpoint >= checkpoint_interval
+        ):
+            checkpoint()
+            last_checkpoint = time.time()
 
     infos["runtime"] = time.time() - t0
     infos["success"] = proof.check_goals()
     infos["steps"] = step
+    infos["facts"] = proof.dep_graph.added - added_before
+    infos["caches"] = proof.dep_graph.cache_stats()
+    infos["rule stats"] = {
+        reason: stats.as_dict() for reason, stats in proof.matcher.rule_stats.items()
+    }
     for goal in proof.goals:
         if goal.check():
             infos[goal.pretty() + " succeeded"] = True
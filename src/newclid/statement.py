@@ -10,10 +10,14 @@ if TYPE_CHECKING:
     from newclid.predicates.predicate import Predicate
     from newclid.dependencies.dependency_graph import DependencyGraph
 
+_NOT_CACHED = object()
+
 
 class Statement:
     """One predicate applied to a set of points and values. Comes with a proof that args are well ordered"""
 
+    __slots__ = ("predicate", "args", "dep_graph")
+
     def __init__(
         self,
         predicate: type[Predicate],
@@ -37,9 +41,15 @@ class Statement:
 
     def check_numerical(self) -> bool:
         """Check if the statement is numerically sound."""
-        if self in self.dep_graph.check_numerical:
-            return self.dep_graph.check_numerical[self]
+        res = self.dep_graph.check_numerical.get(self)
+        if res is not None:
+            return res
         res = self.predicate.check_numerical(self)
+        if res:
+            holds = self.dep_graph.symbols_graph.check_configurations(
+                self.predicate, self.args
+            )
+            res = holds is None or holds
         self.dep_graph.check_numerical[self] = res
         return res
 
@@ -65,8 +75,9 @@ class Statement:
     def from_tokens(
         cls, tokens: tuple[str, ...], dep_graph: DependencyGraph
     ) -> Optional[Statement]:
-        if tokens in dep_graph.token_statement:
-            return dep_graph.token_statement[tokens]
+        cached = dep_graph.token_statement.get(tokens, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached  # type: ignore
 
         pred = NAME_TO_PREDICATE[tokens[0]]
         parsed = pred.parse(tokens[1:], dep_graph)
@@ -1,9 +1,11 @@
 from fractions import Fraction
+from functools import lru_cache
+import math
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Generator, Optional, Sequence, TypeVar
 from pyvis.network import Network  # type: ignore
 
-from newclid.numerical import close_enough
+from newclid.numerical import ATOM, REL_TOL
 
 if TYPE_CHECKING:
     from newclid.statement import Statement
@@ -15,6 +17,8 @@ class InfQuotientError(Exception):
 
 # maximum denominator for a fraction.
 MAX_DENOMINATOR = 1000000
+# decimal places kept on the values memoized by get_quotient.
+QUOTIENT_DIGITS = 12
 
 T = TypeVar("T")
 
@@ -25,18 +29,40 @@ def notNone(x: Optional[T]) -> T:
 
 
 def get_quotient(v: Any) -> Fraction:
-    v = float(v)
-    n = v
-    d = 1
-    while not close_enough(n, round(n)):
-        d += 1
-        n += v
-        if d > MAX_DENOMINATOR:
-            e = InfQuotientError(v)
-            raise e
-
-    n = int(round(n))
-    return Fraction(n, d)
+    """Fraction n / d with the smallest d such that d * v is close enough to n.
+
+    Raises InfQuotientError if that denominator would exceed MAX_DENOMINATOR.
+    """
+    return _get_quotient(round(float(v), QUOTIENT_DIGITS))
+
+
+@lru_cache(maxsize=4096)
+def _get_quotient(v: float) -> Fraction:
+    if abs(v) < 4 * ATOM:
+        return Fraction(0)
+    # For n != 0, close_enough(d * v, n) reduces to |v - n/d| < REL_TOL * max(|v|, |n/d|)
+    # as the absolute tolerance is smaller, so n/d must lie in an open interval around v.
+    low = Fraction(abs(v)) * (1 - Fraction(REL_TOL))
+    high = Fraction(abs(v)) / (1 - Fraction(REL_TOL))
+    f = _simplest_between(low, high)
+    if f.denominator > MAX_DENOMINATOR:
+        raise InfQuotientError(v)
+    return f if v > 0 else -f
+
+
+def _simplest_between(low: Fraction, high: Fraction) -> Fraction:
+    """Fraction with the smallest denominator in the open interval (low, high).
+
+    Expects 0 <= low < high, walks down the Stern-Brocot tree
+    along the continued fraction expansions of the bounds.
+    """
+    integer = math.floor(low) + 1
+    if integer < high:
+        return Fraction(integer)
+    integer -= 1
+    if low == integer:
+        return integer + 1 / Fraction(math.floor(1 / (high - integer)) + 1)
+    return integer + 1 / _simplest_between(1 / (high - integer), 1 / (low - integer))
 
 
 def atomize(s: str, split_by: Optional[str] = None) -> tuple[str, ...]:
@@ -93,6 +119,10 @@ def runtime_cache_path(problem_path: Optional[Path]):
     return problem_path / "runtime_cache.json" if problem_path else None
 
 
+def numerical_cache_path(problem_path: Optional[Path]):
+    return problem_path / "numerical_cache.json" if problem_path else None
+
+
 def run_static_server(directory_to_serve: Path):
     print(f"command to run the server: python -m http.server -d {directory_to_serve}")
 
@@ -0,0 +1,22 @@
+from newclid.agent.backward_chaining import BackwardChaining
+from tests.fixtures import orthocenter_aux_builder, orthocenter_builder
+
+
+class TestBackwardChaining:
+    def test_orthocenter_aux_should_succeed_backward(self):
+        agent = BackwardChaining(max_depth=4)
+        solver = orthocenter_aux_builder().with_deductive_agent(agent).build()
+        assert solver.run()
+        assert agent.fallback is None
+
+    def test_only_rules_relevant_to_the_goal_are_matched(self):
+        agent = BackwardChaining(max_depth=4)
+        solver = orthocenter_aux_builder().with_deductive_agent(agent).build()
+        assert solver.run()
+        assert 0 < len(agent.matched) < len(solver.rules)
+
+    def test_orthocenter_should_exhaust(self):
+        agent = BackwardChaining(max_depth=1)
+        solver = orthocenter_builder().with_deductive_agent(agent).build()
+        assert not solver.run()
+        assert agent.fallback is not None
@@ -0,0 +1,71 @@
+import pytest
+
+from newclid.agent.best_first import BestFirst, goal_proximity
+from newclid.agent.ddarn import DDARN
+from newclid.dependencies.dependency import Dependency
+from newclid.formulations.rule import Rule
+from tests.fixtures import orthocenter_aux_builder, orthocenter_builder
+
+
+class TestBestFirst:
+    def test_orthocenter_aux_should_succeed(self):
+        solver = orthocenter_aux_builder().with_deductive_agent(BestFirst()).build()
+        assert solver.run()
+
+    def test_orthocenter_should_exhaust(self):
+        solver = (
+            orthocenter_builder()
+            .with_deductive_agent(BestFirst(heuristics=[(goal_proximity, 1.0)]))
+            .build()
+        )
+        assert not solver.run()
+
+    def test_fewer_steps_than_breadth_first(self):
+        steps = {}
+        for agent in (DDARN(), BestFirst()):
+            solver = orthocenter_aux_builder().with_deductive_agent(agent).build()
+            assert solver.run()
+            steps[type(agent)] = solver.run_infos["steps"]
+        assert steps[BestFirst] < steps[DDARN]
+
+    def test_best_dependency_is_applied_across_rules(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        solver = orthocenter_aux_builder().build()
+        # Dependencies of the later rules score higher.
+        rank = {rule.descrption: i for i, rule in enumerate(solver.rules)}
+        agent = BestFirst(heuristics=[(lambda _, dep, __: rank[dep.reason], 1.0)])
+        solver.deductive_agent = agent
+        first: list[tuple[str, list[str]]] = []
+        apply_dep = solver.proof.apply_dep
+
+        def recording_apply_dep(dep: Dependency) -> bool:
+            if not first:
+                pending = [
+                    d.reason for _, _, d in agent.queue if isinstance(d, Dependency)
+                ]
+                first.append((dep.reason, pending))
+            return apply_dep(dep)
+
+        monkeypatch.setattr(solver.proof, "apply_dep", recording_apply_dep)
+        assert solver.run()
+        ((applied, pending),) = first
+        assert min(rank[reason] for reason in pending) < rank[applied]
+        assert rank[applied] == max(rank[reason] for reason in pending + [applied])
+
+    def test_useful_rules_are_matched_first(self, monkeypatch: pytest.MonkeyPatch):
+        solver = orthocenter_aux_builder().build()
+        agent = BestFirst()
+        useful = solver.rules[-1].descrption
+        agent.applications[useful] = agent.successes[useful] = 10
+        solver.deductive_agent = agent
+        matched: list[str] = []
+        match_theorem = solver.proof.match_theorem
+
+        def recording_match_theorem(rule: Rule):
+            matched.append(rule.descrption)
+            return match_theorem(rule)
+
+        monkeypatch.setattr(solver.proof, "match_theorem", recording_match_theorem)
+        assert solver.run()
+        assert matched[0] == useful
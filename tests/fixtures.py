@@ -1,6 +1,33 @@
 from newclid.api import GeometricSolver, GeometricSolverBuilder
 from newclid.numerical.distances import PointTooCloseError, PointTooFarError
 
+ORTHOCENTER = (
+    "a b c = triangle a b c; d = on_tline d b a c, on_tline d c a b ? perp a d b c"
+)
+# With the auxiliary point e, DDARN proves the goal.
+ORTHOCENTER_AUX = (
+    "a b c = triangle a b c; "
+    "d = on_tline d b a c, on_tline d c a b; "
+    "e = on_line e a c, on_line e b d "
+    "? perp a d b c"
+)
+
+
+def orthocenter_builder(seed: int = 998244353) -> GeometricSolverBuilder:
+    return (
+        GeometricSolverBuilder(seed=seed)
+        .load_problem_from_txt(ORTHOCENTER)
+        .without_figure()
+    )
+
+
+def orthocenter_aux_builder(seed: int = 998244353) -> GeometricSolverBuilder:
+    return (
+        GeometricSolverBuilder(seed=seed)
+        .load_problem_from_txt(ORTHOCENTER_AUX)
+        .without_figure()
+    )
+
 
 def build_until_works(
     builder: GeometricSolverBuilder, max_attempts: int = 100
@@ -0,0 +1,40 @@
+from newclid.agent.ddarn import DDARN
+from newclid.dependencies.caches import BoundedCache
+from tests.fixtures import orthocenter_aux_builder
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache: BoundedCache[str, int] = BoundedCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+    cache["c"] = 3
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.evictions == 1
+    assert cache.get("b") is None
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_bounded_cache_keeps_pinned_entries():
+    cache: BoundedCache[str, int] = BoundedCache(
+        1, is_pinned=lambda _, value: value < 0
+    )
+    cache["pinned"] = -1
+    cache["a"] = 1
+    cache["b"] = 2
+    assert set(cache) == {"pinned", "b"}
+    assert cache.stats()["pinned"] == 1
+
+
+def test_solve_with_small_cache_budget():
+    solver = (
+        orthocenter_aux_builder()
+        .with_deductive_agent(DDARN())
+        .with_cache_budget(100)
+        .build()
+    )
+    assert solver.run()
+    token_statement = solver.proof.dep_graph.token_statement
+    assert token_statement.evictions > 0
+    assert token_statement.stats()["pinned"] > 0
@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from newclid.agent.backward_chaining import BackwardChaining
+from newclid.api import GeometricSolver
+from newclid.checkpoint import PICKLE_RECURSION_LIMIT, pickle_copy
+from newclid.run_loop import RunBudget
+from tests.fixtures import orthocenter_aux_builder
+
+
+def _build() -> GeometricSolver:
+    return orthocenter_aux_builder().build()
+
+
+def _proof_text(solver: GeometricSolver, tmp_path: Path) -> str:
+    out_file = tmp_path / "proof_steps.txt"
+    solver.write_proof_steps(out_file)
+    return out_file.read_text()
+
+
+def test_resumed_run_ends_as_uninterrupted_run(tmp_path: Path):
+    uninterrupted = _build()
+    assert uninterrupted.run()
+
+    checkpoint_path = tmp_path / "run.ckpt"
+    interrupted = _build()
+    assert not interrupted.run(
+        RunBudget(max_steps=100), checkpoint_path=checkpoint_path
+    )
+    assert checkpoint_path.exists()
+
+    resumed = GeometricSolver.from_checkpoint(checkpoint_path)
+    assert resumed.run()
+    assert resumed.run_infos["steps"] == uninterrupted.run_infos["steps"]
+    assert resumed.run_infos["facts"] == uninterrupted.run_infos["facts"]
+    assert _proof_text(resumed, tmp_path) == _proof_text(uninterrupted, tmp_path)
+
+
+def test_checkpoints_at_interval(tmp_path: Path):
+    checkpoint_path = tmp_path / "run.ckpt"
+    solver = _build()
+    assert solver.run(checkpoint_path=checkpoint_path, checkpoint_interval=0)
+    resumed = GeometricSolver.from_checkpoint(checkpoint_path)
+    assert resumed.resumed is not None
+    assert resumed.resumed.steps == solver.run_infos["steps"] - 1
+
+
+def test_unpicklable_run_is_not_checkpointed(tmp_path: Path):
+    checkpoint_path = tmp_path / "run.ckpt"
+    solver = orthocenter_aux_builder().with_deductive_agent(BackwardChaining()).build()
+    assert solver.run(checkpoint_path=checkpoint_path, checkpoint_interval=0)
+    assert not checkpoint_path.exists()
+    assert not list(tmp_path.iterdir())
+
+
+class _Chain:
+    def __init__(self, next: Optional["_Chain"]) -> None:
+        self.next = next
+
+
+def test_too_deep_objects_raise_recursion_error():
+    chain = None
+    for _ in range(PICKLE_RECURSION_LIMIT):
+        chain = _Chain(chain)
+    with pytest.raises(RecursionError):
+        pickle_copy(chain)
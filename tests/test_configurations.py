@@ -0,0 +1,81 @@
+import itertools
+
+import numpy as np
+
+from newclid.api import GeometricSolverBuilder
+from newclid.dependencies.symbols import Point
+from newclid.predicates import NAME_TO_PREDICATE
+from newclid.statement import Statement
+
+PROBLEM = (
+    "a b c = triangle a b c; "
+    "d = midpoint d a b; "
+    "o = circle o a b c; "
+    "h = orthocenter h a b c; "
+    "e = foot e a b c "
+    "? perp a h b c"
+)
+
+
+def test_coordinates_checks_agree_with_points_checks():
+    proof = GeometricSolverBuilder(seed=5).load_problem_from_txt(PROBLEM).build().proof
+    symbols_graph = proof.symbols_graph
+    points = symbols_graph.nodes_of_type(Point)
+    xy = symbols_graph.figure.xy
+    index = symbols_graph.figure.index
+    rng = np.random.default_rng(0)
+    arities = {"coll": 3, "midp": 3, "circle": 4, "cyclic": 4, "para": 4}
+    arities.update({"perp": 4, "cong": 4, "eqangle": 8, "eqratio": 8})
+    true_args = [
+        ("coll", "a d b"),
+        ("midp", "d a b"),
+        ("circle", "o a b c"),
+        ("cyclic", "a b c a"),
+        ("perp", "a h b c"),
+        ("cong", "o a o b"),
+        ("eqangle", "a e e c a e e b"),
+        ("eqratio", "d a d b o a o b"),
+        ("para", "a h a e"),
+    ]
+    cases = [
+        (name, tuple(symbols_graph.names2points(args.split())))
+        for name, args in true_args
+    ]
+    for name, arity in arities.items():
+        for _ in range(30):
+            cases.append((name, tuple(rng.choice(points, arity))))  # type: ignore
+    for name, args in cases:
+        predicate = NAME_TO_PREDICATE[name]
+        degenerate = itertools.chain(
+            itertools.combinations(args[:3], 2), zip(args[::2], args[1::2])
+        )
+        if any(a == b for a, b in degenerate):
+            continue
+        expected = predicate.check_numerical_points(args)
+        coordinates = xy[[index[p.name] for p in args]][None]
+        assert predicate.check_numerical_coordinates(coordinates)[0] == expected
+
+
+def test_statement_must_hold_in_every_configuration():
+    solver = (
+        GeometricSolverBuilder(seed=5)
+        .load_problem_from_txt(PROBLEM)
+        .with_numerical_configurations(3)
+        .build()
+    )
+    proof = solver.proof
+    assert proof.symbols_graph.configurations.shape == (3, 7, 2)
+    assert all(goal.check_numerical() for goal in proof.goals)
+
+    moved = {
+        name: node.num
+        for name, node in proof.symbols_graph.name2node.items()
+        if isinstance(node, Point)
+    }
+    d = proof.symbols_graph.name2node["d"].num
+    moved["d"] = d + (moved["a"] - moved["b"]).rot90() * 0.1
+    proof.symbols_graph.set_configurations([moved])
+    proof.dep_graph.check_numerical.clear()
+    midpoint = Statement.from_tokens(("midp", "d", "a", "b"), proof.dep_graph)
+    assert midpoint is not None and not midpoint.check_numerical()
+    assert solver.run()
@@ -0,0 +1,57 @@
+import numpy as np
+
+from newclid.numerical.geometries import PointNum
+from newclid.numerical.invariants import FigureInvariants
+
+
+def test_extended_figure_matches_figure_built_at_once():
+    rng = np.random.default_rng(42)
+    points = {name: PointNum(*rng.uniform(-1, 1, 2)) for name in "abcdef"}
+    at_once = FigureInvariants(points)
+    extended = FigureInvariants({name: points[name] for name in "abc"})
+    extended.extend({name: points[name] for name in "bde"})
+    extended.extend({"f": points["f"]})
+    assert extended.names == at_once.names
+    for matrix in ("distance", "distance2", "direction"):
+        assert np.allclose(getattr(extended, matrix), getattr(at_once, matrix))
+    a, b = at_once.indices("ab")
+    assert np.isclose(at_once.distance[a, b], points["a"].distance(points["b"]))
+    assert np.isclose(
+        at_once.direction[a, b], (points["b"] - points["a"]).angle() % np.pi
+    )
+
+
+def test_lines_and_circles_are_memoized_per_unordered_points():
+    points = {
+        "a": PointNum(0.0, 0.0),
+        "b": PointNum(2.0, 0.0),
+        "c": PointNum(0.0, 2.0),
+        "d": PointNum(1.0, 0.0),
+    }
+    figure = FigureInvariants(points)
+    a, b, c, d = figure.indices("abcd")
+    assert figure.line(a, b) is figure.line(b, a)
+    assert figure.line(a, b).same(figure.line(a, d))
+    circle = figure.circle(a, b, c)
+    assert circle is figure.circle(c, a, b)
+    assert circle is not None and circle.center.close_enough(PointNum(1.0, 1.0))
+    assert figure.circle(a, b, d) is None
+
+
+def test_group_tables_are_extended_with_new_points():
+    rng = np.random.default_rng(7)
+    points = {name: PointNum(*rng.uniform(-1, 1, 2)) for name in "abcdefg"}
+    at_once = FigureInvariants(points)
+    extended = FigureInvariants({name: points[name] for name in "abcd"})
+    for name, slots in (("eqangle", (0, 1, 2, 3, 0, 1, 4, 5)), ("cong", (0, 1, 0, 2))):
+        extended.bindings(name, slots)
+    extended.extend({name: points[name] for name in "efg"})
+    for name, slots in (("eqangle", (0, 1, 2, 3, 0, 1, 4, 5)), ("cong", (0, 1, 0, 2))):
+        rows = extended.bindings(name, slots)
+        assert {tuple(row) for row in rows.tolist()} == {
+            tuple(row) for row in at_once.bindings(name, slots).tolist()
+        }
+    table = extended._group_tables[("cong", (0, 1))]
+    assert table.n == extended.n == 7
+    extended.bindings("cong", (2, 3, 2, 4))
+    assert extended._group_tables[("cong", (0, 1))] is table
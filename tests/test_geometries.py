@@ -0,0 +1,18 @@
+import numpy as np
+
+from newclid.numerical.geometries import LineNum, PointNum
+
+
+def test_point_operations_keep_plain_floats():
+    a = PointNum(np.float64(1.0), "2")
+    b = PointNum(1.0 + 1e-12, 2.0)
+    for p in (a, a + b, a - b, a * np.float64(2), 2 * a, a / 2, a.rot90(), a.flip()):
+        assert type(p) is PointNum
+        assert type(p.x) is float and type(p.y) is float
+    difference = b - a
+    assert difference.x != 0.0
+    assert difference.close_enough(PointNum(0.0, 0.0))
+    assert a.distance(b) == 0.0
+    foot = PointNum(0.0, 1.0).foot(LineNum(PointNum(-1.0, 0.0), PointNum(1.0, 0.0)))
+    assert foot.close_enough(PointNum(0.0, 0.0))
+    assert type(abs(a)) is float
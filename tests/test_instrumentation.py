@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+import newclid.instrumentation
+from newclid.algebraic_reasoning.tables import Table
+from newclid.dependencies.symbols_graph import SymbolsGraph
+from newclid.instrumentation import INSTRUMENTATION, count, instrumented, summarize
+from tests.fixtures import orthocenter_aux_builder
+
+
+def test_hot_paths_in_run_infos():
+    solver = orthocenter_aux_builder().with_instrumentation().build()
+    assert solver.run()
+    hot_paths = solver.run_infos["hot paths"]
+    for name in (
+        "ar.add_expr",
+        "ar.why",
+        "ar.linprog",
+        "line_thru_pair.new_line",
+        "matcher.premise_check.passes",
+    ):
+        assert hot_paths[name]["calls"] > 0
+    assert (
+        hot_paths["matcher.premise_check.passes"]["calls"]
+        < hot_paths["matcher.premise_check"]["calls"]
+    )
+    assert hot_paths["ar.why"]["time"] >= hot_paths["ar.linprog"]["time"] > 0
+    assert solver.hot_paths is not None
+    assert hot_paths == summarize(solver.hot_paths)
+    caches = solver.run_infos["caches"]
+    assert caches["check_numerical"]["misses"] > 0
+    assert caches["token_statement"]["hits"] > 0
+
+
+def test_instrumentation_is_scoped_to_the_solver():
+    timed = [Table.add_expr, Table.why, SymbolsGraph.line_thru_pair]
+    instrumented_solver = orthocenter_aux_builder().with_instrumentation().build()
+    assert instrumented_solver.run()
+    assert not INSTRUMENTATION.enabled
+    assert [Table.add_expr, Table.why, SymbolsGraph.line_thru_pair] == timed
+
+    solver = orthocenter_aux_builder().build()
+    assert solver.run()
+    assert "hot paths" not in solver.run_infos
+    assert not INSTRUMENTATION.stats
+
+
+def test_nested_blocks_record_into_their_own_stats():
+    with instrumented() as outer:
+        count("outer")
+        with instrumented() as inner:
+            count("inner")
+        count("outer")
+    assert summarize(outer) == {"outer": {"calls": 2, "time": 0.0}}
+    assert summarize(inner) == {"inner": {"calls": 1, "time": 0.0}}
+    assert not INSTRUMENTATION.enabled
+
+
+def test_solvers_of_other_threads_are_not_recorded():
+    solved: list[bool] = []
+
+    def solve() -> None:
+        solved.append(orthocenter_aux_builder().build().run())
+
+    with instrumented() as stats:
+        thread = threading.Thread(target=solve)
+        thread.start()
+        thread.join()
+    assert solved == [True]
+    assert not stats
+
+
+def test_failed_install_restores_the_wrapped_paths(monkeypatch: pytest.MonkeyPatch):
+    timed = [Table.add_expr, Table.why]
+    missing = ("newclid.algebraic_reasoning.tables", "Table", "missing", "missing")
+    monkeypatch.setattr(
+        newclid.instrumentation,
+        "TIMED_PATHS",
+        newclid.instrumentation.TIMED_PATHS + (missing,),
+    )
+    with pytest.raises(KeyError):
+        with instrumented():
+            pass
+    assert [Table.add_expr, Table.why] == timed
+    assert not INSTRUMENTATION.enabled
@@ -0,0 +1,59 @@
+from newclid.api import GeometricSolverBuilder
+from newclid.formulations.clause import Clause
+from newclid.formulations.rule import Rule
+from newclid.match_theorems import Matcher, compile_rule
+from newclid.predicates import Coll, Para
+from tests.fixtures import orthocenter_builder
+
+
+def test_compile_rule_resolves_predicates_and_slots():
+    rule = Rule.from_string("para A B C D, coll A B E => para A E C D")
+    compiled = compile_rule(rule)
+    assert compiled.variables == ("A", "B", "C", "D", "E")
+    assert [p.predicate for p in compiled.premises] == [Para, Coll]
+    assert compiled.conclusions[0].tokens(("a", "b", "c", "d", "e")) == (
+        "para",
+        "a",
+        "e",
+        "c",
+        "d",
+    )
+    assert compile_rule(rule) is compiled
+
+
+def test_invariant_candidates_match_brute_force():
+    solver = (
+        GeometricSolverBuilder(seed=998244353)
+        .load_problem_from_txt(
+            "a b c = triangle a b c; "
+            "o = circle o a b c; "
+            "d = on_tline d b a c, on_tline d c a b; "
+            "m = midpoint m b c "
+            "? perp a d b c"
+        )
+        .build()
+    )
+    matcher = solver.proof.matcher
+    for rule in solver.rules:
+        matcher.use_invariants = True
+        matcher.cache_theorem(rule)
+        with_invariants = matcher.cache[rule]
+        matcher.use_invariants = False
+        matcher.cache_theorem(rule)
+        assert with_invariants == matcher.cache[rule], str(rule)
+
+
+def test_matches_are_extended_with_new_points_only():
+    solver = orthocenter_builder().build()
+    proof = solver.proof
+    for rule in solver.rules:
+        proof.matcher.cached_dependencies(rule)
+    (construction,) = Clause.parse_line("e = on_line e a c, on_line e b d")
+    proof.add_construction(construction)
+    assert all(rule in proof.matcher.cache for rule in solver.rules)
+
+    fresh = Matcher(proof.dep_graph, None, proof.rng)
+    for rule in solver.rules:
+        assert proof.matcher.cached_dependencies(rule) == fresh.cached_dependencies(
+            rule
+        )
@@ -1,7 +1,15 @@
 """Unit tests for problem.py."""
 
+from pathlib import Path
+
 import pytest
+from newclid.agent.ddarn import DDARN
 from newclid.api import GeometricSolverBuilder
+from newclid.formulations.clause import Clause
+from newclid.proof import ProofState
+from newclid.run_loop import run_loop
+from newclid.statement import Statement
+from tests.fixtures import orthocenter_builder
 
 
 class TestProblem:
@@ -31,3 +39,86 @@ class TestProblem:
         self.solver_builder.load_problem_from_txt(
             "a b c = triangle a b c",
         ).build()
+
+    def test_add_construction_replays_positions(self):
+        solver = self.solver_builder.load_problem_from_txt(
+            "a b c = triangle a b c; "
+            "o = circle o a b c; "
+            "d = on_circle d o a "
+            "? cong o a o d",
+        ).build()
+        problem = self.solver_builder.problemJGEX
+        replayed = ProofState(
+            rng=solver.proof.rng, defs=solver.proof.defs, draw_figure=False
+        )
+        name2node = solver.proof.symbols_graph.name2node
+        for construction in problem.constructions:
+            positions = tuple(name2node[name].num for name in construction.points)
+            assert replayed.add_construction(construction, positions) == positions
+        assert replayed.symbols_graph.name2node["d"].num == name2node["d"].num
+        assert len(replayed.dep_graph.hyper_graph) == len(
+            solver.proof.dep_graph.hyper_graph
+        )
+
+    def test_build_reloads_saved_configuration(self, tmp_path: Path):
+        problem = (
+            "a b c = triangle a b c; "
+            "h = on_tline h b a c, on_tline h c a b "
+            "? perp a h b c"
+        )
+
+        def build():
+            return (
+                GeometricSolverBuilder(seed=7)
+                .load_problem_from_txt(problem)
+                .with_problem_path(tmp_path)
+                .without_figure()
+                .build()
+            )
+
+        sampled = build().proof
+        assert (tmp_path / "numerical_cache.json").exists()
+        reloaded = build().proof
+        for name in "abch":
+            num = reloaded.symbols_graph.name2node[name].num
+            expected = sampled.symbols_graph.name2node[name].num
+            assert (num.x, num.y) == (expected.x, expected.y)
+        assert reloaded.rng.bit_generator.state == sampled.rng.bit_generator.state
+        assert reloaded.goals[0].check_numerical()
+
+    def test_goals_checked_again_only_after_additions(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        proof = (
+            self.solver_builder.load_problem_from_txt(
+                "a b c = triangle a b c; "
+                "h = on_tline h b a c, on_tline h c a b "
+                "? perp a h b c",
+            )
+            .build()
+            .proof
+        )
+        checked: list[Statement] = []
+        monkeypatch.setattr(Statement, "check", lambda s: checked.append(s) or False)
+        assert not proof.check_goals()
+        assert not proof.check_goals()
+        assert len(checked) == 1
+        proof.dep_graph.added += 1
+        assert not proof.check_goals()
+        assert len(checked) == 2
+
+    def test_fork_adds_construction_without_changing_parent(self):
+        solver = orthocenter_builder().build()
+        assert not solver.run()
+        parent = solver.proof
+        statements = len(parent.dep_graph.hyper_graph)
+
+        child = parent.fork()
+        assert len(child.dep_graph.hyper_graph) == statements
+        (construction,) = Clause.parse_line("e = on_line e a c, on_line e b d")
+        child.add_construction(construction)
+        assert run_loop(DDARN(), child, solver.rules)["success"]
+
+        assert "e" not in parent.symbols_graph.name2node
+        assert len(parent.dep_graph.hyper_graph) == statements
+        assert not parent.check_goals()
@@ -0,0 +1,58 @@
+from newclid.formulations.rule import Rule
+from newclid.rule_pruning import prune_rules
+from tests.fixtures import orthocenter_builder
+
+
+def test_rules_with_premises_that_never_hold_are_unreachable():
+    rules = Rule.parse_text(
+        "midpoint rule\n"
+        "midp M A B, midp N A C => para M N B C\n"
+        "perpendicular rule\n"
+        "perp A B C D, perp C D E F => para A B E F\n"
+    )
+    pruning = prune_rules(rules, premises=["perp"], goals=["para"])
+    assert pruning.kept == [rules[1]]
+    assert pruning.unreachable == [rules[0]]
+    assert not pruning.irrelevant
+
+
+def test_rules_that_cannot_contribute_to_the_goals_are_irrelevant():
+    rules = Rule.parse_text(
+        "congruent triangles\n"
+        "cong A B P Q, cong B C Q R, cong C A R P => contri A B C P Q R\n"
+        "circle\n"
+        "cong O A O B, cong O A O C, cong O A O D => cyclic A B C D\n"
+    )
+    pruning = prune_rules(rules, premises=["cong"], goals=["cyclic"])
+    assert pruning.kept == [rules[1]]
+    assert pruning.irrelevant == [rules[0]]
+
+
+def test_rules_deduced_by_angle_chasing_are_kept():
+    rules = Rule.parse_text(
+        "cyclic angles\ncyclic A B P Q => eqangle P A P B Q A Q B\n"
+    )
+    pruning = prune_rules(rules, premises=["cyclic"], goals=["perp"])
+    assert pruning.kept == rules
+
+
+def test_pruned_rules_are_reported_in_run_infos():
+    solver = (
+        orthocenter_builder()
+        .load_rules_from_txt(
+            "congruent triangles\n"
+            "cong A B P Q, cong B C Q R, cong C A R P, ncoll A B C, "
+            "sameclock A B C P Q R => contri A B C P Q R\n"
+            "cyclic angles\n"
+            "cyclic A B P Q => eqangle P A P B Q A Q B\n"
+            "perpendicular rule\n"
+            "perp A B C D, perp C D E F => para A B E F\n"
+        )
+        .with_rule_pruning()
+        .build()
+    )
+    solver.run()
+    assert solver.run_infos["pruned rules"] == {
+        "unreachable": ["congruent triangles", "cyclic angles"],
+        "irrelevant": [],
+    }
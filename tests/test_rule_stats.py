@@ -0,0 +1,43 @@
+import pytest
+
+from newclid.dependencies.dependency import Dependency
+from newclid.rule_stats import RULE_STATS_COLUMNS, format_rule_stats
+from tests.fixtures import orthocenter_aux_builder
+
+
+def test_rule_stats_in_run_infos(monkeypatch: pytest.MonkeyPatch):
+    solver = orthocenter_aux_builder().build()
+    added: list[str] = []
+    apply_dep = solver.proof.apply_dep
+
+    def recording_apply_dep(dep: Dependency) -> bool:
+        new = apply_dep(dep)
+        if new:
+            added.append(dep.reason)
+        return new
+
+    monkeypatch.setattr(solver.proof, "apply_dep", recording_apply_dep)
+    assert solver.run()
+    stats = solver.run_infos["rule stats"]
+    assert set(stats) <= {rule.descrption for rule in solver.rules}
+    for reason, row in stats.items():
+        assert set(row) == set(RULE_STATS_COLUMNS)
+        assert row["numerical_passes"] <= row["mappings"]
+        assert row["new_facts"] == added.count(reason) <= row["applied"]
+    assert any(row["new_facts"] for row in stats.values())
+
+
+def test_format_rule_stats_sorted_by_column():
+    stats = {
+        "r00": {column: 0 for column in RULE_STATS_COLUMNS},
+        "r01": {column: 1 for column in RULE_STATS_COLUMNS},
+    }
+    stats["r00"]["match_time"] = 2.0
+    stats["r01"]["match_time"] = 1.0
+    lines = format_rule_stats(stats, sort_by="match_time").splitlines()
+    assert lines[0].split() == ["rule", *RULE_STATS_COLUMNS]
+    assert [line.split()[0] for line in lines[1:]] == ["r00", "r01"]
+    lines = format_rule_stats(stats, sort_by="applied").splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["r01", "r00"]
+    with pytest.raises(ValueError):
+        format_rule_stats(stats, sort_by="unknown")
@@ -0,0 +1,32 @@
+import pytest
+
+from newclid.run_loop import RunBudget, exceeded_budget
+from tests.fixtures import orthocenter_aux_builder
+
+
+class TestRunBudget:
+    @pytest.fixture(autouse=True)
+    def setUpClass(self):
+        self.solver = orthocenter_aux_builder().build()
+
+    def test_stops_after_max_steps_with_partial_infos(self):
+        assert not self.solver.run(RunBudget(max_steps=10))
+        infos = self.solver.run_infos
+        assert infos["stopped_by"] == "max_steps"
+        assert infos["steps"] == 10
+        assert infos["AD ⟂ BC succeeded"] is False
+
+    def test_stops_after_max_facts(self):
+        assert not self.solver.run(RunBudget(max_facts=1))
+        assert self.solver.run_infos["stopped_by"] == "max_facts"
+        assert self.solver.run_infos["facts"] >= 1
+
+    def test_unreached_budget_does_not_stop_the_run(self):
+        assert self.solver.run(RunBudget(timeout=600, max_steps=100000))
+        assert "stopped_by" not in self.solver.run_infos
+
+
+def test_exceeded_budget():
+    assert exceeded_budget(RunBudget(), 1e6, 10**6, 10**6) is None
+    assert exceeded_budget(RunBudget(timeout=1.0), 1.5, 0, 0) == "timeout"
+    assert exceeded_budget(RunBudget(max_rss_mb=1e-3), 0.0, 0, 0) == "max_rss_mb"
@@ -0,0 +1,100 @@
+import logging
+
+import numpy as np
+
+import pytest
+
+from newclid.api import GeometricSolverBuilder
+from newclid.numerical.distances import (
+    PointSetStatistics,
+    PointTooCloseError,
+    PointTooFarError,
+    within_distance_bounds,
+)
+from newclid.numerical.geometries import (
+    CircleNum,
+    InvalidSampleError,
+    LineNum,
+    PointNum,
+)
+
+
+def test_sample_within_filter_is_deterministic_and_valid():
+    points = [PointNum(0.0, 0.0), PointNum(1.0, 0.0), PointNum(0.0, 1.0)]
+    forms = [
+        LineNum(PointNum(-1.0, 0.01), PointNum(2.0, 0.02)),
+        CircleNum(PointNum(0.0, 0.0), 1.0),
+    ]
+    for form in forms:
+        samples = [
+            form.sample_within(
+                points,
+                rng=np.random.default_rng(7),
+                valid=lambda xy: within_distance_bounds(xy, points),
+            )
+            for _ in range(2)
+        ]
+        assert (samples[0].x, samples[0].y) == (samples[1].x, samples[1].y)
+        xy = np.array([[samples[0].x, samples[0].y]])
+        assert within_distance_bounds(xy, points).all()
+
+
+def test_point_set_statistics_tracks_mean_distance_incrementally():
+    rng = np.random.default_rng(3)
+    points = [PointNum(x, y) for x, y in rng.uniform(-1, 1, (12, 2))]
+    statistics = PointSetStatistics(points[:5])
+    for point in points[5:]:
+        statistics.add([point])
+    mean = np.mean(
+        [
+            p.distance(q)
+            for i, p in enumerate(points)
+            for j, q in enumerate(points)
+            if i != j
+        ]
+    )
+    assert statistics.mean_distance == pytest.approx(mean)
+
+    with pytest.raises(PointTooCloseError):
+        statistics.check([PointNum(points[0].x + 1e-3 * mean, points[0].y)])
+    with pytest.raises(PointTooFarError):
+        statistics.check([PointNum(100 * mean, 0.0)])
+    statistics.check([PointNum(0.1, 0.1)])
+
+
+def test_sample_within_without_valid_candidate():
+    points = [PointNum(0.0, 0.0), PointNum(1.0, 0.0)]
+    with pytest.raises(InvalidSampleError):
+        LineNum(points[0], points[1]).sample_within(
+            points,
+            rng=np.random.default_rng(7),
+            valid=lambda xy: np.zeros(len(xy), dtype=bool),
+        )
+
+
+def test_clause_without_valid_candidate_is_sampled_again(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    within_bounds = PointSetStatistics.within_bounds
+    rejected: list[int] = []
+
+    def reject_first_batch(
+        self: PointSetStatistics, candidates: np.ndarray, *args, **kwargs
+    ) -> np.ndarray:
+        if not rejected:
+            rejected.append(len(candidates))
+            return np.zeros(len(candidates), dtype=bool)
+        return within_bounds(self, candidates, *args, **kwargs)
+
+    monkeypatch.setattr(PointSetStatistics, "within_bounds", reject_first_batch)
+    caplog.set_level(logging.DEBUG, logger="newclid.proof")
+    proof = (
+        GeometricSolverBuilder(seed=998244353)
+        .load_problem_from_txt("a b c = triangle a b c; d = on_line d a b")
+        .without_figure()
+        .build()
+        .proof
+    )
+    assert rejected
+    assert "d" in proof.symbols_graph.name2node
+    assert not any("Backtracking" in message for message in caplog.messages)
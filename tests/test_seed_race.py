@@ -0,0 +1,64 @@
+import pytest
+
+from newclid.agent.ddarn import DDARN
+from newclid.api import GeometricSolverBuilder, _run_seed
+from newclid.formulations.problem import ProblemJGEX
+from newclid.proof import ProofState
+from newclid.run_loop import RunBudget
+from tests.fixtures import orthocenter_aux_builder
+
+
+def test_race_seeds_reports_reproducible_winner():
+    builder = orthocenter_aux_builder().with_deductive_agent(DDARN())
+    result = builder.race_seeds([1, 2, 3], max_workers=2)
+    assert result.success
+    assert result.seed in (1, 2, 3)
+    winner = result.solver()
+    assert winner is not None
+    assert winner.run_infos == result.run_infos
+    assert winner.proof.check_goals()
+
+    builder.seed = result.seed
+    solver = builder.build()
+    assert solver.run()
+    assert solver.run_infos["steps"] == result.run_infos["steps"]
+
+
+def test_raced_runs_stop_at_the_budget():
+    result = orthocenter_aux_builder().race_seeds(
+        [1, 2], max_workers=2, budget=RunBudget(max_steps=10)
+    )
+    assert not result.success
+    assert result.run_infos["stopped_by"] == "max_steps"
+    assert result.run_infos["steps"] == 10
+    assert result.solver() is None
+
+
+def _run_seed_of(problem_txt: str, max_attempts: int):
+    builder = GeometricSolverBuilder()
+    return _run_seed(
+        1,
+        problemJGEX=ProblemJGEX.from_text(problem_txt),
+        defs=builder.defs,
+        rules=builder.rules,
+        deductive_agent=None,
+        max_attempts=max_attempts,
+        cache_budget=None,
+        configurations=1,
+        prune_rules=False,
+    )
+
+
+def test_seed_failing_to_build_loses_the_race():
+    result = _run_seed_of("a b c = triangle a b c ? perp a b b c", max_attempts=3)
+    assert not result.success
+    assert "Build failed" in result.run_infos["error"]
+
+
+def test_errors_of_the_code_are_not_hidden(monkeypatch: pytest.MonkeyPatch):
+    def broken_build(*args, **kwargs):
+        raise TypeError("broken")
+
+    monkeypatch.setattr(ProofState, "build_problemJGEX", broken_build)
+    with pytest.raises(TypeError):
+        _run_seed_of("a b c = triangle a b c", max_attempts=3)
@@ -0,0 +1,44 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from newclid.numerical import close_enough
+from newclid.tools import InfQuotientError, get_quotient
+
+
+def linear_get_quotient(v: float, max_denominator: int = 10_000) -> Fraction:
+    n = v
+    d = 1
+    while not close_enough(n, round(n)):
+        d += 1
+        n += v
+        if d > max_denominator:
+            raise InfQuotientError(v)
+    return Fraction(int(round(n)), d)
+
+
+@pytest.mark.parametrize(
+    "v,expected",
+    [
+        (0.5, Fraction(1, 2)),
+        (2 / 3, Fraction(2, 3)),
+        (-7 / 12, Fraction(-7, 12)),
+        (np.sqrt(2), Fraction(41, 29)),
+        (3.0, Fraction(3)),
+        (1e-12, Fraction(0)),
+    ],
+)
+def test_get_quotient(v: float, expected: Fraction):
+    assert get_quotient(v) == expected
+
+
+def test_get_quotient_matches_linear_search():
+    rng = np.random.default_rng(998244353)
+    for v in rng.uniform(-10, 10, 200):
+        assert get_quotient(v) == linear_get_quotient(v)
+
+
+def test_get_quotient_raises_when_denominator_is_too_large():
+    with pytest.raises(InfQuotientError):
+        get_quotient(1e-8)